@@ -189,15 +189,14 @@ class AtlasManager(BaseModel):
                 schema=var_schema,
                 index_column_names=[x[0] for x in self.db_schema.PAI_VAR_INDEX_COLUMNS],
                 platform_config=self.db_schema.PAI_VAR_PLATFORM_CONFIG,
-                domain=[[0, len(self.db_schema.VAR_DF) - 1]],
+                domain=[[0, self.db_schema.VAR_TABLE.num_rows - 1]],
             )
 
             # TODO: clean this little issue here
             assert set([x[0] for x in self.db_schema.PAI_VAR_COLUMNS]) == set(
                 ["gene", "ens"]
             ), "Make sure that your var df aligns"
-            table = pa.Table.from_pandas(self.db_schema.VAR_DF, preserve_index=False)
-            var.write(table)
+            var.write(self.db_schema.VAR_TABLE)
 
             # create `X` in the measurement
             X_collection = rna_measurement.add_new_collection("X")
@@ -1,13 +1,19 @@
 from pydantic import BaseModel, ConfigDict
 import anndata as ad
+import h5py
 import scipy.sparse as sp
-import numpy as np
 
 from typing import List, Generator, Optional
-from cloudpathlib import AnyPath
+from cloudpathlib import AnyPath, CloudPath
 
 from ..sc_logging import logger
 from ..types.path import ExpandedPath
+from ..utils.sparse_utils import presence_row
+
+# h5py's default chunk cache is 1 MiB over 521 slots per dataset, so larger compressed chunks bypass it and are
+# decompressed again on every access. A prime slot count well above the number of cached chunks keeps collisions rare
+# without the per-dataset hash table growing large.
+H5_CHUNK_CACHE = {"rdcc_nbytes": 16 * 1024 * 1024, "rdcc_nslots": 10_007, "rdcc_w0": 0.75}
 
 
 class H5adCollection(BaseModel):
@@ -45,7 +51,7 @@ class H5adCollection(BaseModel):
 
         if self.include:
             filtered_files = [file for file in all_files if file in self.include]
-            logger.info(f"Filtered files using include parameter: {filtered_files}")
+            logger.info("Filtered files using include parameter: %s", filtered_files)
             return filtered_files
         return all_files
 
@@ -69,14 +75,19 @@ class H5adCollection(BaseModel):
         Returns:
             ad.AnnData: AnnData object containing the data from the H5AD file
         """
-        logger.info(f"Reading H5AD file: {filename} from {self.storage_directory}...")
+        logger.info("Reading H5AD file: %s from %s...", filename, self.storage_directory)
         file_path = self.get_h5ad_path(filename)
 
         try:
+            if not isinstance(file_path, CloudPath):
+                with h5py.File(file_path, "r", **H5_CHUNK_CACHE) as f:
+                    # Files written by anndata >= 0.8 are a single encoded element; older layouts go through read_h5ad
+                    if f.attrs.get("encoding-type") == "anndata":
+                        return ad.io.read_elem(f)
             adata = ad.read_h5ad(file_path)
             return adata
         except Exception as e:
-            logger.error(f"Error reading H5AD file {filename}: {e}")
+            logger.error("Error reading H5AD file %s: %s", filename, e)
             raise
 
     @staticmethod
@@ -109,10 +120,4 @@ class H5adCollection(BaseModel):
         """
         adata = self.get_anndata(filename=filename)
 
-        presence_matrix = np.zeros((1, len(global_var_list)))
-        feature_set = set(adata.var["gene"])
-        for i, feature in enumerate(global_var_list):
-            if feature in feature_set:
-                presence_matrix[:, i] = 1
-
-        return sp.coo_matrix(presence_matrix)
+        return presence_row(global_var_list, adata.var["gene"].to_numpy())
@@ -1,16 +1,92 @@
-from pydantic import BaseModel, ConfigDict, model_validator
+from pydantic import BaseModel, ConfigDict, PrivateAttr, model_validator
+import gzip
+import h5py
+import hashlib
+import os
+import tempfile
+import threading
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import scipy.sparse as sp
 import anndata as ad
+from anndata.io import write_elem
 import numpy as np
+import numpy.typing as npt
 
-from typing import List, Tuple, Optional, Union, Generator
-from fast_matrix_market import mmread
-from cloudpathlib import AnyPath
+from typing import IO, ClassVar, Dict, List, Tuple, Optional, Union, Generator
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from fast_matrix_market import read_coo
+from cloudpathlib import AnyPath, CloudPath, S3Path
+
+try:
+    from isal import igzip_threaded
+except ImportError:  # pragma: no cover - optional dependency
+    igzip_threaded = None
 
 from ..schema import DatabaseSchema
 from ..sc_logging import logger
 from ..types.path import ExpandedPath
+from ..utils.cache import cache_dir
+from ..utils.sparse_utils import coo_to_transposed_csr, presence_row
+
+
+def _s3_list_prefix(cloud_path: S3Path) -> List[str]:
+    """List the immediate children of an S3 "directory" using paginated `ListObjectsV2` calls.
+
+    Only basenames are returned, no `CloudPath` objects are constructed and no per-object requests are made.
+
+    Args:
+        cloud_path (S3Path): The S3 prefix to list
+
+    Returns:
+        List[str]: Basenames of sub-directories (common prefixes) and files directly under the prefix
+    """
+    prefix = cloud_path.key
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+
+    names = []
+    paginator = cloud_path.client.client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=cloud_path.bucket, Prefix=prefix, Delimiter="/"):
+        for common_prefix in page.get("CommonPrefixes", []):
+            names.append(common_prefix["Prefix"][len(prefix) :].rstrip("/"))
+        for content in page.get("Contents", []):
+            name = content["Key"][len(prefix) :]
+            # Skip the "directory marker" object some tools create for the prefix itself
+            if name:
+                names.append(name)
+    return names
+
+
+# Guards every collection's features cache: `read_mtx` and the `iter_anndata` prefetch read features concurrently.
+# Module level rather than per instance, as collections are pickled to worker processes and locks are not picklable
+_FEATURES_CACHE_LOCK = threading.Lock()
+
+
+def _open_inflating(fileobj: IO[bytes]) -> IO[bytes]:
+    """Wrap a gzipped binary stream in a decompressing reader.
+
+    With python-isal installed, inflate runs on a background thread so it overlaps with the parser consuming the
+    stream; otherwise the standard library `gzip` reader is used.
+    """
+    if igzip_threaded is not None:
+        return igzip_threaded.open(fileobj, "rb", threads=1)
+    return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+
+def _string_index(series: pd.Series) -> pd.Index:
+    """Build a string index from a column, skipping the `astype(str)` pass when the values already are strings."""
+    if series.dtype == object:
+        return pd.Index(series, dtype=object, copy=False)
+    if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.categories.dtype == object:
+        codes = series.cat.codes.to_numpy()
+        if (codes >= 0).all():
+            # Gather the category strings by code rather than calling str() on every row
+            return pd.Index(series.cat.categories.to_numpy()[codes], dtype=object, copy=False)
+    return pd.Index(series.astype(str), dtype=object, copy=False)
 
 
 class MtxCollection(BaseModel):
@@ -48,7 +124,21 @@ class MtxCollection(BaseModel):
     db_schema: Optional[DatabaseSchema] = None
     include: Optional[List[str]] = None
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True, validate_assignment=False, extra="ignore")
+
+    # Directory listings are cached on the instance; fields are frozen so they cannot go stale
+    _studies: Optional[List[str]] = PrivateAttr(default=None)
+    _samples: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    # Parsed features tables keyed by the md5 of the compressed features file
+    _features_cache: "OrderedDict[str, pd.DataFrame]" = PrivateAttr(default_factory=OrderedDict)
+    _FEATURES_CACHE_SIZE: ClassVar[int] = 8
+
+    # Handler method for each file of a sample directory, in the order `read_mtx` returns them
+    _FILE_HANDLERS: ClassVar[Dict[str, str]] = {
+        "matrix.mtx.gz": "_read_matrix",
+        "barcodes.tsv.gz": "_read_barcodes",
+        "features.tsv.gz": "_read_features",
+    }
 
     @model_validator(mode="after")
     def check_duplicate_samples(self) -> "MtxCollection":
@@ -59,7 +149,7 @@ class MtxCollection(BaseModel):
             for sample in self.list_samples(study):
                 if sample in sample_to_studies:
                     sample_to_studies[sample].append(study)
-                    logger.warning(f"Sample '{sample}' appears in studies: {sample_to_studies[sample]}")
+                    logger.warning("Sample '%s' appears in studies: %s", sample, sample_to_studies[sample])
                 else:
                     sample_to_studies[sample] = [study]
 
@@ -73,26 +163,29 @@ class MtxCollection(BaseModel):
         return self
 
     def list_studies(self) -> List[str]:
-        all_studies = [study_path.parts[-1] for study_path in self.clean_listdir(self.storage_directory)]
-        if self.include:
-            filtered_studies = [study for study in all_studies if study in self.include]
-            logger.info(f"Filtered studies using include parameter: {filtered_studies}")
-            return filtered_studies
-        return all_studies
+        if self._studies is None:
+            all_studies = [study_path.parts[-1] for study_path in self.clean_listdir(self.storage_directory)]
+            if self.include:
+                all_studies = [study for study in all_studies if study in self.include]
+                logger.info("Filtered studies using include parameter: %s", all_studies)
+            self._studies = all_studies
+        return list(self._studies)
 
     def list_samples(self, study_name: str) -> List[str]:
-        study_path = self.storage_directory / study_name / "mtx"
-        return [sample_path.parts[-1] for sample_path in self.clean_listdir(study_path)]
+        if study_name not in self._samples:
+            study_path = self.storage_directory / study_name / "mtx"
+            self._samples[study_name] = [sample_path.parts[-1] for sample_path in self.clean_listdir(study_path)]
+        return list(self._samples[study_name])
 
     def get_sample_metadata(self, study_name: str) -> pd.DataFrame:
         """Get sample metadata for a study.
-        
+
         Requires db_schema to be set.
         """
         if self.db_schema is None:
             raise ValueError("db_schema must be set to get sample metadata")
-            
-        logger.info(f"Reading sample metadata for {study_name} from {self.storage_directory}...")
+
+        logger.info("Reading sample metadata for %s from %s...", study_name, self.storage_directory)
         sample_metadata_path = self.storage_directory / study_name / "sample_metadata" / f"{study_name}.tsv.gz"
 
         return self.read_metadata_file(
@@ -101,13 +194,13 @@ class MtxCollection(BaseModel):
 
     def get_cell_metadata(self, study_name: str) -> pd.DataFrame:
         """Get cell metadata for a study.
-        
+
         Requires db_schema to be set.
         """
         if self.db_schema is None:
             raise ValueError("db_schema must be set to get cell metadata")
-            
-        logger.info(f"Reading cell metadata for {study_name} from {self.storage_directory}...")
+
+        logger.info("Reading cell metadata for %s from %s...", study_name, self.storage_directory)
         cell_metadata_path = self.storage_directory / study_name / "cell_metadata" / f"{study_name}.tsv.gz"
 
         return self.read_metadata_file(
@@ -117,7 +210,7 @@ class MtxCollection(BaseModel):
     def get_mtx(
         self, study_name: str, sample_name: str
     ) -> Tuple[Optional[sp.coo_matrix], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-        logger.info(f"Reading mtx for study: {study_name}, sample: {sample_name} from {self.storage_directory}...")
+        logger.info("Reading mtx for study: %s, sample: %s from %s...", study_name, sample_name, self.storage_directory)
         mtx_dir = self.storage_directory / study_name / "mtx" / sample_name
 
         return self.read_mtx(mtx_dir)
@@ -126,27 +219,51 @@ class MtxCollection(BaseModel):
         self, study_name: str, sample_name: str, add_cell_metadata: bool = True, add_sample_metadata: bool = True
     ) -> pd.DataFrame:
         """Get observation metadata for a study and sample.
-        
+
         Args:
             study_name (str): Name of the study
             sample_name (str): Name of the sample
             add_cell_metadata (bool): Whether to add cell-level metadata
             add_sample_metadata (bool): Whether to add sample-level metadata
-            
+
         Returns:
             pd.DataFrame: DataFrame containing observation metadata
-            
+
         Raises:
             ValueError: If db_schema is not set and metadata is requested
         """
         if (add_cell_metadata or add_sample_metadata) and self.db_schema is None:
             raise ValueError("db_schema must be set to get observation metadata")
-            
-        logger.info(f"Getting observation metadata for study: {study_name}, sample: {sample_name}...")
-        _, barcodes, _ = self.get_mtx(study_name=study_name, sample_name=sample_name)
-        
+
+        logger.info("Getting observation metadata for study: %s, sample: %s...", study_name, sample_name)
+        # Only the barcodes are needed here, skip reading the matrix and features
+        _, barcodes, _ = self.read_mtx(
+            self.storage_directory / study_name / "mtx" / sample_name, files=["barcodes.tsv.gz"]
+        )
+
+        return self._build_obs(
+            study_name=study_name,
+            barcodes=barcodes,
+            add_cell_metadata=add_cell_metadata,
+            add_sample_metadata=add_sample_metadata,
+        )
+
+    def _build_obs(
+        self,
+        study_name: str,
+        barcodes: pd.DataFrame,
+        add_cell_metadata: bool,
+        add_sample_metadata: bool,
+        cell_metadata: Optional[pd.DataFrame] = None,
+        sample_metadata: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """Join cell/sample metadata onto a sample's barcodes dataframe and index it by barcode.
+
+        Metadata that is not passed in is read for the study.
+        """
         if add_cell_metadata:
-            cell_metadata = self.get_cell_metadata(study_name=study_name)
+            if cell_metadata is None:
+                cell_metadata = self.get_cell_metadata(study_name=study_name)
             barcodes = self.add_metadata_to_df(
                 dataframe=barcodes,
                 metadata_df=cell_metadata,
@@ -154,15 +271,16 @@ class MtxCollection(BaseModel):
                 columns_to_add=[x[0] for x in self.db_schema.PAI_OBS_CELL_COLUMNS],
             )
         if add_sample_metadata:
-            sample_metadata = self.get_sample_metadata(study_name=study_name)
+            if sample_metadata is None:
+                sample_metadata = self.get_sample_metadata(study_name=study_name)
             barcodes = self.add_metadata_to_df(
                 dataframe=barcodes,
                 metadata_df=sample_metadata,
                 join=["sample_name"],
                 columns_to_add=[x[0] for x in self.db_schema.PAI_OBS_SAMPLE_COLUMNS],
             )
-            
-        barcodes.index = barcodes["barcode"].astype(str)
+
+        barcodes.index = _string_index(barcodes["barcode"])
         barcodes.index.name = "index"
         return barcodes
 
@@ -170,35 +288,169 @@ class MtxCollection(BaseModel):
         self, study_name: str, sample_name: str, add_cell_metadata: bool = True, add_sample_metadata: bool = True
     ) -> ad.AnnData:
         """Get an AnnData object for a study and sample.
-        
+
         Args:
             study_name (str): Name of the study
             sample_name (str): Name of the sample
             add_cell_metadata (bool): Whether to add cell-level metadata
             add_sample_metadata (bool): Whether to add sample-level metadata
-            
+
         Returns:
             ad.AnnData: AnnData object containing the data
-            
+
         Raises:
             ValueError: If db_schema is not set and metadata is requested
         """
         if (add_cell_metadata or add_sample_metadata) and self.db_schema is None:
             raise ValueError("db_schema must be set to get AnnData with metadata")
-            
+
         logger.info(
-            f"Assembling AnnData for study: {study_name}, sample: {sample_name} from {self.storage_directory}..."
+            "Assembling AnnData for study: %s, sample: %s from %s...", study_name, sample_name, self.storage_directory
         )
-        mtx, _, features = self.get_mtx(study_name=study_name, sample_name=sample_name)
-        obs = self.get_obs_metadata(
+        mtx, barcodes, features = self.get_mtx(study_name=study_name, sample_name=sample_name)
+        obs = self._build_obs(
             study_name=study_name,
-            sample_name=sample_name,
+            barcodes=barcodes,
             add_cell_metadata=add_cell_metadata,
-            add_sample_metadata=add_sample_metadata
+            add_sample_metadata=add_sample_metadata,
         )
         anndata = ad.AnnData(X=mtx, obs=obs, var=features)
         return anndata
 
+    def iter_anndata(
+        self,
+        study_name: str,
+        add_cell_metadata: bool = True,
+        add_sample_metadata: bool = True,
+        prefetch: int = 2,
+    ) -> Generator[Tuple[str, ad.AnnData], None, None]:
+        """Yield an AnnData object for every sample of a study.
+
+        The files of the next `prefetch` samples are fetched and parsed on background threads while the current
+        sample is being assembled, and the study's metadata is read only once.
+
+        Args:
+            study_name (str): Name of the study
+            add_cell_metadata (bool): Whether to add cell-level metadata
+            add_sample_metadata (bool): Whether to add sample-level metadata
+            prefetch (int): Number of samples to read ahead of the one being assembled; 0 reads each sample inline
+
+        Yields:
+            Tuple[str, ad.AnnData]: Sample name and its AnnData object
+
+        Raises:
+            ValueError: If db_schema is not set and metadata is requested, or if prefetch is negative
+        """
+        if (add_cell_metadata or add_sample_metadata) and self.db_schema is None:
+            raise ValueError("db_schema must be set to get AnnData with metadata")
+        if prefetch < 0:
+            raise ValueError(f"prefetch must be zero or positive, got {prefetch}")
+
+        cell_metadata = self.get_cell_metadata(study_name=study_name) if add_cell_metadata else None
+        sample_metadata = self.get_sample_metadata(study_name=study_name) if add_sample_metadata else None
+
+        for sample_name, (mtx, barcodes, features) in self._iter_mtx(study_name, prefetch):
+            obs = self._build_obs(
+                study_name=study_name,
+                barcodes=barcodes,
+                add_cell_metadata=add_cell_metadata,
+                add_sample_metadata=add_sample_metadata,
+                cell_metadata=cell_metadata,
+                sample_metadata=sample_metadata,
+            )
+            yield sample_name, ad.AnnData(X=mtx, obs=obs, var=features)
+
+    def _iter_mtx(
+        self, study_name: str, prefetch: int
+    ) -> Generator[
+        Tuple[str, Tuple[Optional[sp.coo_matrix], Optional[pd.DataFrame], Optional[pd.DataFrame]]], None, None
+    ]:
+        """Yield `get_mtx` for every sample of a study in order, with the next `prefetch` samples read on threads."""
+        samples = self.list_samples(study_name)
+        if prefetch == 0:
+            for sample_name in samples:
+                yield sample_name, self.get_mtx(study_name, sample_name)
+            return
+
+        with ThreadPoolExecutor(max_workers=prefetch) as pool:
+            in_flight = deque(pool.submit(self.get_mtx, study_name, sample_name) for sample_name in samples[:prefetch])
+            for i, sample_name in enumerate(samples):
+                result = in_flight.popleft().result()
+                if i + prefetch < len(samples):
+                    in_flight.append(pool.submit(self.get_mtx, study_name, samples[i + prefetch]))
+                yield sample_name, result
+
+    def write_anndata(
+        self,
+        study_name: str,
+        sample_name: str,
+        out_path: AnyPath,
+        add_cell_metadata: bool = True,
+        add_sample_metadata: bool = True,
+    ) -> AnyPath:
+        """Write a study/sample as an `.h5ad` file without assembling an in-memory AnnData object.
+
+        The matrix is still read fully into memory, but each component is written as soon as it is available and its
+        reference dropped afterwards, so the matrix is not held alongside the merged metadata or an AnnData object.
+
+        Args:
+            study_name (str): Name of the study
+            sample_name (str): Name of the sample
+            out_path (AnyPath): Destination `.h5ad` path, local or cloud
+            add_cell_metadata (bool): Whether to add cell-level metadata
+            add_sample_metadata (bool): Whether to add sample-level metadata
+
+        Returns:
+            AnyPath: The path written to
+
+        Raises:
+            ValueError: If db_schema is not set and metadata is requested
+        """
+        if (add_cell_metadata or add_sample_metadata) and self.db_schema is None:
+            raise ValueError("db_schema must be set to write AnnData with metadata")
+
+        if isinstance(out_path, CloudPath):
+            # h5py needs a seekable local file, so write to a temporary file and upload it
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                local_path = AnyPath(tmp_dir) / out_path.name
+                self.write_anndata(
+                    study_name=study_name,
+                    sample_name=sample_name,
+                    out_path=local_path,
+                    add_cell_metadata=add_cell_metadata,
+                    add_sample_metadata=add_sample_metadata,
+                )
+                out_path.upload_from(local_path, force_overwrite_to_cloud=True)
+            return out_path
+
+        logger.info("Writing AnnData for study: %s, sample: %s to %s...", study_name, sample_name, out_path)
+        mtx, barcodes, features = self.get_mtx(study_name=study_name, sample_name=sample_name)
+
+        with h5py.File(out_path, "w") as f:
+            f.attrs["encoding-type"] = "anndata"
+            f.attrs["encoding-version"] = "0.1.0"
+
+            write_elem(f, "X", mtx)
+            del mtx
+
+            write_elem(f, "var", features)
+            del features
+
+            obs = self._build_obs(
+                study_name=study_name,
+                barcodes=barcodes,
+                add_cell_metadata=add_cell_metadata,
+                add_sample_metadata=add_sample_metadata,
+            )
+            del barcodes
+            write_elem(f, "obs", obs)
+            del obs
+
+            for key in ("obsm", "varm", "obsp", "varp", "layers", "uns"):
+                write_elem(f, key, {})
+
+        return out_path
+
     @staticmethod
     def clean_listdir(
         path: AnyPath, ignore_patterns: List[str] = [".DS_Store", ".log"]
@@ -213,6 +465,13 @@ class MtxCollection(BaseModel):
         Yields:
             AnyPath: Valid directory components.
         """
+        # S3 listings are served from `ListObjectsV2` pages directly rather than `iterdir`
+        if isinstance(path, S3Path):
+            for name in _s3_list_prefix(path):
+                if not any(pattern in name for pattern in ignore_patterns):
+                    yield path / name
+            return
+
         for item in path.iterdir():
             if not any(pattern in item.parts[-1] for pattern in ignore_patterns):
                 yield item
@@ -220,28 +479,78 @@ class MtxCollection(BaseModel):
     def read_mtx(
         self, root_fp: AnyPath, files: Optional[List[str]] = None
     ) -> Tuple[Optional[sp.csr_matrix], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-        matrix, barcodes_df, features_df = None, None, None
         if files is None:
-            files = ["matrix.mtx.gz", "barcodes.tsv.gz", "features.tsv.gz"]
-        file_paths = [root_fp / fp for fp in files]
-        for fp in file_paths:
-            if "matrix.mtx.gz" in str(fp):
-                matrix = self.mmread(fp).tocsr()
-            elif "barcodes.tsv.gz" in str(fp):
-                barcodes_df = self.read_csv(fp, sep="\t", names=["barcode"])
-                sample_name = fp.parent.parts[-1]
-                barcodes_df["sample_name"] = sample_name
-            elif "features.tsv.gz" in str(fp):
-                features_df = self.read_csv(fp, sep="\t", usecols=[0, 1], index_col=0, names=["index", "gene"])
-
-        return matrix, barcodes_df, features_df
+            files = list(self._FILE_HANDLERS)
+        handlers = {name: getattr(self, self._FILE_HANDLERS[name]) for name in files if name in self._FILE_HANDLERS}
+
+        # Inflate + parse of each file releases the GIL, so reading them concurrently overlaps the smaller
+        # barcode/feature reads with the matrix read
+        if len(handlers) > 1:
+            with ThreadPoolExecutor(max_workers=len(handlers)) as pool:
+                futures = {name: pool.submit(handler, root_fp / name) for name, handler in handlers.items()}
+                results = {name: future.result() for name, future in futures.items()}
+        else:
+            results = {name: handler(root_fp / name) for name, handler in handlers.items()}
+
+        return tuple(results.get(name) for name in self._FILE_HANDLERS)
+
+    def _read_matrix(self, fp: AnyPath) -> sp.csr_matrix:
+        x_dtype = self.db_schema.X_DTYPE.to_pandas_dtype() if self.db_schema is not None else np.float32
+        return self.mmread(fp, dtype=x_dtype)
+
+    def _read_barcodes(self, fp: AnyPath) -> pd.DataFrame:
+        barcodes_df = self.read_tsv(fp, names=["barcode"])
+        sample_name = fp.parent.parts[-1]
+        # Single-category column: one int8 code per barcode instead of N copies of the same string
+        barcodes_df["sample_name"] = pd.Categorical.from_codes(
+            np.zeros(len(barcodes_df), dtype=np.int8), categories=[sample_name]
+        )
+        return barcodes_df
+
+    def _read_features(self, fp: AnyPath) -> pd.DataFrame:
+        # Samples of a study usually share an identical feature list, so parsed frames are keyed on the digest of
+        # the compressed file and only inflated + parsed once. A copy is handed out so callers can't alter the cache
+        data = fp.read_bytes()
+        key = hashlib.md5(data, usedforsecurity=False).hexdigest()
+
+        with _FEATURES_CACHE_LOCK:
+            features_df = self._features_cache.get(key)
+            if features_df is not None:
+                self._features_cache.move_to_end(key)
+                return features_df.copy()
+
+        # Parsed outside the lock so that different files are still parsed concurrently
+        features_df = self.read_tsv(data, names=["index", "gene"]).set_index("index")
+        with _FEATURES_CACHE_LOCK:
+            self._features_cache[key] = features_df
+            while len(self._features_cache) > self._FEATURES_CACHE_SIZE:
+                self._features_cache.popitem(last=False)
+        return features_df.copy()
+
+    def read_feature_names(self, study_name: str, sample_name: str) -> pa.Array:
+        """Read the gene names of a sample's features file as an Arrow array, without building a DataFrame
+
+        Args:
+            study_name (str): Name of the study
+            sample_name (str): Name of the sample
+
+        Returns:
+            pa.Array: Gene names in file order
+        """
+        fp = self.storage_directory / study_name / "mtx" / sample_name / "features.tsv.gz"
+        return self._read_tsv_table(fp, names=["index", "gene"]).column("gene").combine_chunks()
 
     def read_metadata_file(self, fp: AnyPath, reindex_columns: List[str]) -> pd.DataFrame:
         try:
-            metadata_df = self.read_csv(fp, sep="\t")
-            metadata_df = metadata_df.reindex(columns=reindex_columns, fill_value="Unknown")
+            metadata_df = self.read_cached_csv(fp, columns=reindex_columns, sep="\t")
+            # Only the requested columns were read; fill in the ones the file lacks instead of reindexing a copy
+            for column in reindex_columns:
+                if column not in metadata_df.columns:
+                    metadata_df[column] = "Unknown"
+            if list(metadata_df.columns) != reindex_columns:
+                metadata_df = metadata_df[reindex_columns]
         except Exception as e:
-            logger.info(f"File not found: {fp}")
+            logger.info("File not found: %s", fp)
             metadata_df = pd.DataFrame(columns=reindex_columns)
 
         return metadata_df
@@ -259,12 +568,124 @@ class MtxCollection(BaseModel):
         return df
 
     @staticmethod
-    def mmread(filepath: AnyPath) -> sp.csr_matrix:
+    def read_cached_csv(filepath: AnyPath, columns: Optional[List[str]] = None, **kwargs) -> pd.DataFrame:
+        """Read a CSV through a parquet cache kept under `cache_dir()`.
+
+        Only `columns` are parsed from the source and cached. The cache file is keyed on the source path, its
+        modification time and size, the column selection and the read options, so an edited source is parsed again
+        and the raw data tree is never written to. It is written to a temporary file
+        and moved into place, so concurrent readers never see a partial file. Any failure to read or write the
+        cache only costs the cache: the source is parsed instead.
+
+        Args:
+            filepath (AnyPath): Path to the source CSV file
+            columns (Optional[List[str]]): Columns to return, in this order. Columns absent from the file are skipped.
+                All columns are returned if not set
+            **kwargs: Keyword arguments forwarded to `pd.read_csv` on a cache miss
+
+        Returns:
+            pd.DataFrame: Parsed dataframe
+        """
+        stat = filepath.stat()
+        wanted = None if columns is None else sorted(set(columns))
+        key = repr((str(filepath), stat.st_mtime, stat.st_size, wanted, sorted(kwargs.items())))
+        cache_path = cache_dir() / f"metadata-{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.parquet"
+
+        try:
+            parquet_file = pq.ParquetFile(cache_path)
+            if columns is not None:
+                available = set(parquet_file.schema_arrow.names)
+                columns = [column for column in columns if column in available]
+            return parquet_file.read(columns=columns, use_pandas_metadata=True).to_pandas()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Could not read metadata cache %s, parsing %s instead: %s", cache_path, filepath, e)
+
+        if wanted is not None:
+            # A callable skips the columns the file lacks instead of raising on them
+            kwargs["usecols"] = lambda column: column in wanted
+        df = MtxCollection.read_csv(filepath, **kwargs)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            df.to_parquet(tmp_path, compression="zstd", compression_level=3)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning("Could not write metadata cache %s: %s", cache_path, e)
+
+        if columns is not None:
+            df = df[[column for column in columns if column in df.columns]]
+        return df
+
+    @staticmethod
+    def _open_gz(source: Union[AnyPath, bytes]) -> pa.NativeFile:
+        """Open a (possibly gzipped) file or in-memory file contents as an Arrow stream that inflates on the fly."""
+        if isinstance(source, bytes):
+            compression = "gzip" if source[:2] == b"\x1f\x8b" else None
+            return pa.input_stream(pa.py_buffer(source), compression=compression)
+
+        compression = "gzip" if source.suffix == ".gz" else None
+        if isinstance(source, CloudPath):
+            return pa.input_stream(source.open("rb"), compression=compression)
+        return pa.input_stream(str(source), compression=compression)
+
+    @staticmethod
+    def read_tsv(source: Union[AnyPath, bytes], names: List[str]) -> pd.DataFrame:
+        """Read the leading columns of a header-less TSV as strings using Arrow's multithreaded CSV reader.
+
+        Args:
+            source (Union[AnyPath, bytes]): Path to the (possibly gzipped) TSV file, or the raw contents of one
+            names (List[str]): Names for the leading columns to read, any further columns are skipped
+
+        Returns:
+            pd.DataFrame: DataFrame with one string column per name
+        """
+        return MtxCollection._read_tsv_table(source, names).to_pandas()
+
+    @staticmethod
+    def _read_tsv_table(source: Union[AnyPath, bytes], names: List[str]) -> pa.Table:
+        """Arrow table behind `read_tsv`, for callers that don't need a DataFrame."""
+        if not isinstance(source, (AnyPath, bytes)):
+            raise ValueError("Unsupported filepath type. Filepath needs to be cloudpathlib AnyPath.")
+
+        columns = [f"f{i}" for i in range(len(names))]
+        with MtxCollection._open_gz(source) as stream:
+            table = pacsv.read_csv(
+                stream,
+                read_options=pacsv.ReadOptions(autogenerate_column_names=True, block_size=8 << 20),
+                parse_options=pacsv.ParseOptions(delimiter="\t"),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=columns, column_types={column: pa.string() for column in columns}
+                ),
+            )
+        return table.rename_columns(names)
+
+    @staticmethod
+    def mmread(filepath: AnyPath, dtype: npt.DTypeLike = np.float32) -> sp.csr_matrix:
         if not isinstance(filepath, AnyPath):
             raise ValueError("Unsupported filepath type. Filepath needs to be cloudpathlib AnyPath.")
-        matrix = mmread(filepath).T.tocsr()
 
-        return matrix
+        if filepath.suffix != ".gz" and not isinstance(filepath, S3Path):
+            (data, (row, col)), shape = read_coo(filepath)
+        else:
+            # Stream S3 objects straight into the parser instead of letting cloudpathlib download them to
+            # the local cache first, so that network transfer, inflate and parsing overlap
+            if isinstance(filepath, S3Path):
+                raw = filepath.client.client.get_object(Bucket=filepath.bucket, Key=filepath.key)["Body"]
+            else:
+                raw = open(filepath, "rb")
+            try:
+                if filepath.suffix == ".gz":
+                    with _open_inflating(raw) as stream:
+                        (data, (row, col)), shape = read_coo(stream)
+                else:
+                    (data, (row, col)), shape = read_coo(raw)
+            finally:
+                raw.close()
+
+        # MTX files are stored features x barcodes, build the barcodes x features CSR directly from the triplets
+        return coo_to_transposed_csr(data, row, col, shape, dtype=dtype)
 
     @staticmethod
     def add_metadata_to_df(
@@ -294,13 +715,22 @@ class MtxCollection(BaseModel):
             if not (col in metadata_df.columns and col in dataframe.columns):
                 raise ValueError(f"{col} not in both dataframes...")
             if col in columns_to_add:
-                logger.warning(f"{col} specified in `join` and `columns_to_add`, this should be handled gracefully...")
+                logger.warning("%s specified in `join` and `columns_to_add`, this should be handled gracefully...", col)
 
         # Deals with dropping columns that are in both dataframes but not mentioned in `join`
         for col in columns_to_add:
             if col in original_columns and col not in join:
                 dataframe.drop(columns=col, inplace=True, axis=1)
 
+        # Join columns that are already categorical on the sample side (e.g. the single-category `sample_name`) are
+        # merged on integer codes; metadata values outside those categories cannot match and become missing codes.
+        # Other join keys are left alone so the output does not carry the whole study's values as categories
+        join_dtypes = {
+            col: dataframe[col].dtype for col in join if isinstance(dataframe[col].dtype, pd.CategoricalDtype)
+        }
+        if join_dtypes:
+            metadata_df = metadata_df.astype(join_dtypes)
+
         merged_obs = dataframe.merge(metadata_df, how="left", on=join).reindex(
             list(set(original_columns + columns_to_add)), axis=1
         )
@@ -321,13 +751,4 @@ class MtxCollection(BaseModel):
         Returns:
             sp.coo_matrix: Presence matrix with the presence of each feature in the study-sample
         """
-        root_fp = self.storage_directory / study_name / "mtx" / sample_name
-        _, _, features_df = self.read_mtx(root_fp, files=["features.tsv.gz"])
-
-        presence_matrix = np.zeros((1, len(global_var_list)))
-        feature_set = set(features_df["gene"])
-        for i, feature in enumerate(global_var_list):
-            if feature in feature_set:
-                presence_matrix[:, i] = 1
-
-        return sp.coo_matrix(presence_matrix)
+        return presence_row(global_var_list, self.read_feature_names(study_name, sample_name))
@@ -1,34 +1,48 @@
+import os
+import threading
 import tiledbsoma as soma
 
 from pydantic import BaseModel, ConfigDict, computed_field
 from functools import lru_cache
 from typing import Optional, Union
 from enum import Enum
+from types import MappingProxyType
 
 from ..collection import MtxCollection, H5adCollection
 from ..schema import DatabaseSchema, load_schema
 
+DEFAULT_TILEDB_CONFIG = MappingProxyType(
+    {
+        "py.max_incomplete_retries": 100,
+        "py.init_buffer_bytes": 536870912,
+        "soma.init_buffer_bytes": 536870912,
+        "sm.consolidation.buffer_size": 1073741824,
+        "sm.consolidation.step_max_frags": 100,
+        "sm.consolidation.step_min_frags": 3,
+    }
+)
 
-DEFAULT_TILEDB_CONFIG = {
-    "py.max_incomplete_retries": 100,
-    "py.init_buffer_bytes": 536870912,
-    "soma.init_buffer_bytes": 536870912,
-    "sm.consolidation.buffer_size": 1073741824,
-    "sm.consolidation.step_max_frags": 100,
-    "sm.consolidation.step_min_frags": 3,
-}
+# One context per thread (and per process, in case a worker was forked from a process that already made one)
+_THREAD_CONTEXT = threading.local()
 
 
-# TODO: convert to singleton to speed up (if necessary)
 def SOMA_TileDB_Context() -> soma.options.SOMATileDBContext:
     """
-    Create and return a SOMA TileDB context with default configuration.
+    Return a SOMA TileDB context with default configuration.
+
+    The context is created once per thread and reused on later calls.
 
     Returns:
     - soma.options.SOMATileDBContext
         The configured SOMA TileDB context.
     """
-    return soma.options.SOMATileDBContext(tiledb_config=DEFAULT_TILEDB_CONFIG, timestamp=None)
+    pid = os.getpid()
+    if getattr(_THREAD_CONTEXT, "pid", None) != pid:
+        _THREAD_CONTEXT.context = soma.options.SOMATileDBContext(
+            tiledb_config=dict(DEFAULT_TILEDB_CONFIG), timestamp=None
+        )
+        _THREAD_CONTEXT.pid = pid
+    return _THREAD_CONTEXT.context
 
 
 class RawCollectionType(str, Enum):
@@ -68,15 +82,10 @@ class PipelineConfig(BaseModel):
     def collection(self) -> Union[MtxCollection, H5adCollection]:
         if self.raw_collection_type == RawCollectionType.MTX:
             return MtxCollection(
-                storage_directory=self.raw_storage_dir,
-                db_schema=self.db_schema,
-                include=self.include_studies
+                storage_directory=self.raw_storage_dir, db_schema=self.db_schema, include=self.include_studies
             )
         else:
-            return H5adCollection(
-                storage_directory=self.raw_storage_dir,
-                include=self.include_studies
-            )
+            return H5adCollection(storage_directory=self.raw_storage_dir, include=self.include_studies)
 
 
 # TODO: figure out if LRU cache works in multiprocessing
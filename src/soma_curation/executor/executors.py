@@ -1,11 +1,52 @@
 import abc
 import concurrent.futures
-from typing import Any, List, Callable, Tuple, TypeVar, Generic
+import itertools
+import multiprocessing
+import sys
+from multiprocessing.context import BaseContext
+from typing import Any, Iterable, List, Callable, Optional, Sequence, Sized, Tuple, TypeVar, Generic
 
 from ..sc_logging import init_worker_logging
 
 T = TypeVar("T")
 
+_PACKAGE = __name__.rsplit(".", 2)[0]
+
+# Imported once by the forkserver, so forked workers start with them already loaded
+DEFAULT_PRELOAD = (
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "anndata",
+    "tiledbsoma",
+    f"{_PACKAGE}.ingest.ingestion_funcs",
+    f"{_PACKAGE}.schema",
+)
+
+
+def get_worker_context(preload: Sequence[str] = DEFAULT_PRELOAD) -> BaseContext:
+    """
+    Multiprocessing context for worker pools: `forkserver` with `preload` imported once in the server, so each
+    worker is forked with the heavy modules already loaded instead of re-importing them as under `spawn`.
+    Falls back to `spawn` on Windows, where forkserver is not available.
+    """
+    if sys.platform == "win32":
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(list(preload))
+    return ctx
+
+
+def _run_chunk(func: Callable[..., T], tasks: List[Tuple[Any, ...]]) -> List[Tuple[bool, Any]]:
+    """Run several tasks in one worker call, returning `(succeeded, result or exception)` for each."""
+    outcomes = []
+    for task in tasks:
+        try:
+            outcomes.append((True, func(*task)))
+        except Exception as exc:
+            outcomes.append((False, exc))
+    return outcomes
+
 
 class ExecutionResult(Generic[T]):
     """
@@ -40,11 +81,30 @@ class ExecutorBase(abc.ABC):
         pass
 
 
+class SerialExecutor(ExecutorBase):
+    """
+    Run tasks one after another in the calling process, capturing errors the same way as
+    `MultiprocessingExecutor`. No worker initializer is run, and nothing is pickled.
+    """
+
+    def run(self, tasks: Iterable[Tuple[Any, ...]], func: Callable[..., T]) -> ExecutionResult[T]:
+        result = ExecutionResult[T]()
+        for task in tasks:
+            if isinstance(task, str):
+                raise ValueError("Tasks need to be tuples!")
+            try:
+                result.successes.append(func(*task))
+            except Exception as exc:
+                result.failures.append((task, exc))
+        return result
+
+
 class MultiprocessingExecutor(ExecutorBase):
     """
     Run tasks in parallel using ProcessPoolExecutor, capturing errors gracefully.
     Optionally takes an `initializer` function (plus `initargs`) that is invoked
-    *once* in each worker process before it starts running tasks.
+    *once* in each worker process before it starts running tasks, and the
+    multiprocessing `context` to start the workers with (see `get_worker_context`).
     """
 
     def __init__(
@@ -52,25 +112,111 @@ class MultiprocessingExecutor(ExecutorBase):
         processes: int = 4,
         init_worker_logging: Callable[[str, str], None] = init_worker_logging,
         init_args: Tuple[str] = (),
+        context: Optional[BaseContext] = None,
     ):
         self.processes = processes
         self.init_worker_logging = init_worker_logging
         self.init_args = init_args
-
-    def run(self, tasks: Tuple[Any], func: Callable[..., T]) -> ExecutionResult[T]:
+        self.context = context
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "MultiprocessingExecutor":
+        self._pool = self._pool or self._new_pool()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool kept alive by the `with` block, if any."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _new_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=self.context,
+            initializer=self.init_worker_logging,
+            initargs=self.init_args,
+        )
+
+    def run(
+        self,
+        tasks: Iterable[Tuple[Any, ...]],
+        func: Callable[..., T],
+        max_in_flight: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ) -> ExecutionResult[T]:
+        """
+        Run `func(*task)` for every task. `tasks` may be any iterable, including a generator; it is consumed
+        lazily and at most `max_in_flight` chunks (default: 4 per process) are submitted at a time, so the
+        parent's memory does not grow with the number of tasks.
+
+        When called inside `with executor:`, the worker pool is started once and reused by every `run`,
+        so the initializer runs once per worker rather than once per worker per call.
+
+        Tasks are sent to the workers `chunksize` at a time, one pipe round-trip per chunk. By default this is
+        `len(tasks) // (4 * processes)` when `tasks` has a length (so each worker still gets ~4 chunks to balance
+        the load), and 1 for generators. Results and failures are still reported per task.
+        """
         result = ExecutionResult[T]()
-        if isinstance(tasks[0], str):
+        if chunksize is None:
+            chunksize = max(1, len(tasks) // (4 * self.processes)) if isinstance(tasks, Sized) else 1
+        tasks = iter(tasks)
+        first_task = next(tasks, None)
+        if first_task is None:
+            return result
+        if isinstance(first_task, str):
             raise ValueError("Tasks need to be tuples!")
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=self.processes, initializer=self.init_worker_logging, initargs=self.init_args
-        ) as executor:
-            future_to_task = {executor.submit(func, *task): task for task in tasks}
-            for future in concurrent.futures.as_completed(future_to_task):
-                task = future_to_task[future]
+        max_in_flight = max_in_flight or self.processes * 4
+
+        # Inside a `with` block the same workers serve every `run`; otherwise they only live for this call
+        executor = self._pool or self._new_pool()
+        try:
+            all_tasks = itertools.chain([first_task], tasks)
+            future_to_chunk = {}
+            while chunk := list(itertools.islice(all_tasks, chunksize)):
+                if len(future_to_chunk) >= max_in_flight:
+                    done, _ = concurrent.futures.wait(future_to_chunk, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        self._collect(result, future, future_to_chunk.pop(future))
                 try:
-                    output = future.result()
-                    result.successes.append(output)
-                except Exception as exc:
-                    result.failures.append((task, exc))
-
+                    if len(chunk) == 1:
+                        future = executor.submit(func, *chunk[0])
+                    else:
+                        future = executor.submit(_run_chunk, func, chunk)
+                    future_to_chunk[future] = chunk
+                except concurrent.futures.process.BrokenProcessPool as exc:
+                    # Tasks submitted after the pool broke fail the same way as those already in flight
+                    result.failures.extend((task, exc) for task in chunk)
+            for future in concurrent.futures.as_completed(future_to_chunk):
+                self._collect(result, future, future_to_chunk[future])
+        finally:
+            if executor is not self._pool:
+                executor.shutdown(wait=True)
+
+        if executor is self._pool and any(
+            isinstance(exc, concurrent.futures.process.BrokenProcessPool) for _, exc in result.failures
+        ):
+            # A broken pool rejects every later submission, so the next `run` gets fresh workers
+            self.close()
+            self._pool = self._new_pool()
         return result
+
+    @staticmethod
+    def _collect(result: ExecutionResult[T], future: concurrent.futures.Future, chunk: List[Tuple[Any, ...]]) -> None:
+        try:
+            outcome = future.result()
+        except Exception as exc:
+            # Raised by a single task, or the whole chunk was lost (e.g. its worker died)
+            result.failures.extend((task, exc) for task in chunk)
+            return
+        if len(chunk) == 1:
+            result.successes.append(outcome)
+            return
+        for task, (succeeded, value) in zip(chunk, outcome):
+            if succeeded:
+                result.successes.append(value)
+            else:
+                result.failures.append((task, value))
@@ -1,16 +1,26 @@
+import multiprocessing
 import tiledbsoma.io
 import tiledbsoma as soma
 
-from typing import List, Literal, Union
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 from cloudpathlib import AnyPath
 from pathlib import Path
 from tiledbsoma.io import ExperimentAmbientLabelMapping
+from tiledbsoma.io._registration import AxisAmbientLabelMapping  # Private module, see the pin in pyproject.toml
 import pyarrow as pa
 
-from ..sc_logging import logger
+from ..sc_logging import logger, init_worker_queue_logging
 from ..dataset.anndataset import AnnDataset
 from ..config.config import PipelineConfig, SOMA_TileDB_Context
 from ..collection import MtxCollection, H5adCollection
+from ..executor.executors import ExecutorBase
+from ..utils.shared_pickle import SharedPickleHandle, load_shared_pickle
+from ..utils.prefetch import prefetch_local_file
+
+# Per-process inputs shared by every presence task, set once by `init_presence_worker`
+_PRESENCE_WORKER_STATE: Dict[str, Any] = {}
+# Per-process pipeline config shared by every conversion task, set once by `init_pipeline_worker`
+_PIPELINE_WORKER_STATE: Dict[str, Any] = {}
 
 
 def create_registration_mapping(
@@ -19,26 +29,105 @@ def create_registration_mapping(
     measurement_name: Literal["RNA"] = "RNA",
     obs_field_name: str = "barcode",
     var_field_name: str = "gene",
-    context: tiledbsoma.SOMATileDBContext = SOMA_TileDB_Context(),
+    context: Optional[tiledbsoma.SOMATileDBContext] = None,
+    executor: Optional[ExecutorBase] = None,
 ) -> tiledbsoma.io.ExperimentAmbientLabelMapping:
+    """
+    Register `filenames` against the experiment. With an `executor`, the H5AD files are read in parallel by
+    `register_h5ad_task` and only the merge of their labels into the experiment's mapping is serial.
+    """
+    # Resolved per call: a default argument would build one context at import time, in the forkserver that
+    # preloads this module, and every forked worker would inherit it
+    context = context or SOMA_TileDB_Context()
+    if executor is None:
+        return tiledbsoma.io.register_h5ads(
+            experiment_uri=experiment_uri,
+            h5ad_file_names=filenames,
+            measurement_name=measurement_name,
+            obs_field_name=obs_field_name,
+            var_field_name=var_field_name,
+            context=context,
+        )
+
+    result = executor.run(
+        [(filename, measurement_name, obs_field_name, var_field_name) for filename in filenames], register_h5ad_task
+    )
+    if result.failures:
+        task, exc = result.failures[0]
+        raise ValueError(f"Registration failed for {task[0]}: {exc}") from exc
 
-    rm = tiledbsoma.io.register_h5ads(
+    # Join IDs depend on the order the files are registered in, which must not depend on completion order
+    partials = dict(result.successes)
+    baseline = tiledbsoma.io.register_h5ads(
         experiment_uri=experiment_uri,
-        h5ad_file_names=filenames,
+        h5ad_file_names=[],
         measurement_name=measurement_name,
         obs_field_name=obs_field_name,
         var_field_name=var_field_name,
         context=context,
     )
+    return merge_registration_mappings(baseline, [partials[filename] for filename in filenames])
+
+
+def register_h5ad_task(
+    path: str, measurement_name: str, obs_field_name: str, var_field_name: str
+) -> Tuple[str, ExperimentAmbientLabelMapping]:
+    """
+    Registration of a single H5AD file on its own, to be merged by `merge_registration_mappings`.
+    Join IDs in the returned mapping follow the order labels first appear in the file.
+    """
+    rm = ExperimentAmbientLabelMapping.from_h5ad_appends_on_experiment(
+        None,
+        [path],
+        measurement_name=measurement_name,
+        obs_field_name=obs_field_name,
+        var_field_name=var_field_name,
+        context=SOMA_TileDB_Context(),
+    )
+    return path, rm
+
 
-    return rm
+def merge_registration_mappings(
+    baseline: ExperimentAmbientLabelMapping, partials: List[ExperimentAmbientLabelMapping]
+) -> ExperimentAmbientLabelMapping:
+    """
+    Append the labels of each per-file mapping, in order, to `baseline`. New labels get the next join ID on
+    their axis, which yields the same mapping as registering the files one after another with
+    `tiledbsoma.io.register_h5ads` (checked in tests/test_registration.py against the pinned tiledbsoma).
+    """
+    axes = {"obs": baseline.obs_axis, **baseline.var_axes}
+    maps = {name: dict(axis.data) for name, axis in axes.items()}
+    next_ids = {name: axis.get_next_start_soma_joinid() for name, axis in axes.items()}
+    field_names = {name: axis.field_name for name, axis in axes.items()}
+
+    for partial in partials:
+        for name, axis in {"obs": partial.obs_axis, **partial.var_axes}.items():
+            # A per-file mapping always has a raw axis; an empty one only means the file has no raw data
+            if name == "raw" and name not in maps and not axis.data:
+                continue
+            label_map = maps.setdefault(name, {})
+            next_id = next_ids.get(name, 0)
+            for label in axis.data:
+                if label not in label_map:
+                    label_map[label] = next_id
+                    next_id += 1
+            next_ids[name] = next_id
+            field_names.setdefault(name, axis.field_name)
+
+    return ExperimentAmbientLabelMapping(
+        obs_axis=AxisAmbientLabelMapping(data=maps.pop("obs"), field_name=field_names["obs"]),
+        var_axes={
+            name: AxisAmbientLabelMapping(data=data, field_name=field_names[name]) for name, data in maps.items()
+        },
+    )
 
 
 def resize_experiment(
     experiment_uri: str,
     registration_mapping: tiledbsoma.io.ExperimentAmbientLabelMapping,
-    context: tiledbsoma.SOMATileDBContext = SOMA_TileDB_Context(),
+    context: Optional[tiledbsoma.SOMATileDBContext] = None,
 ) -> tiledbsoma.io.ExperimentAmbientLabelMapping:
+    context = context or SOMA_TileDB_Context()
     try:
         tiledbsoma.io.resize_experiment(
             uri=experiment_uri,
@@ -60,6 +149,8 @@ def ingest_h5ad_soma(path: str, experiment_path: str, rm: ExperimentAmbientLabel
     """
     try:
         logger.info(f"[ingest_h5ad] Ingesting {path}")
+        # Readahead of the whole file in the background, instead of HDF5's small reads each waiting on the disk
+        prefetch_local_file(path)
         _ingest_h5ad_soma(
             experiment_uri=experiment_path,
             h5ad_path=path,
@@ -72,6 +163,14 @@ def ingest_h5ad_soma(path: str, experiment_path: str, rm: ExperimentAmbientLabel
         raise
 
 
+def ingest_h5ad_soma_shared(path: str, experiment_path: str, rm_handle: SharedPickleHandle):
+    """
+    Same as `ingest_h5ad_soma`, but with the registration mapping read from shared memory
+    (see `share_pickled`) instead of being pickled into every task.
+    """
+    return ingest_h5ad_soma(path, experiment_path, load_shared_pickle(rm_handle))
+
+
 def convert_and_std_mtx_to_h5ad(study_name: str, sample_name: str, pc: PipelineConfig):
     """
     Function to convert a single (study, sample) to an H5AD file.
@@ -108,6 +207,7 @@ def convert_and_std_mtx_to_h5ad(study_name: str, sample_name: str, pc: PipelineC
         logger.error(f"Error writing study={study_name}, sample={sample_name} to H5AD: {e}")
         raise
 
+
 # TODO: This is a duplicate of the function above. Might need to refactor.
 def convert_and_std_h5ad_to_h5ad(h5ad_path: str, pc: PipelineConfig):
     """
@@ -145,6 +245,25 @@ def convert_and_std_h5ad_to_h5ad(h5ad_path: str, pc: PipelineConfig):
         raise
 
 
+def init_pipeline_worker(log_level: int, log_queue: multiprocessing.Queue, pc: PipelineConfig):
+    """
+    Worker initializer for `convert_mtx_task` and `convert_h5ad_task`. The pipeline config is sent once per
+    worker process here instead of being pickled into every task.
+    """
+    init_worker_queue_logging(log_level, log_queue)
+    _PIPELINE_WORKER_STATE["pc"] = pc
+
+
+def convert_mtx_task(study_name: str, sample_name: str):
+    """`convert_and_std_mtx_to_h5ad` with the pipeline config set by `init_pipeline_worker`."""
+    return convert_and_std_mtx_to_h5ad(study_name, sample_name, _PIPELINE_WORKER_STATE["pc"])
+
+
+def convert_h5ad_task(h5ad_path: str):
+    """`convert_and_std_h5ad_to_h5ad` with the pipeline config set by `init_pipeline_worker`."""
+    return convert_and_std_h5ad_to_h5ad(h5ad_path, _PIPELINE_WORKER_STATE["pc"])
+
+
 def _ingest_h5ad_soma(
     experiment_uri: str,
     h5ad_path: str,
@@ -154,8 +273,9 @@ def _ingest_h5ad_soma(
     var_field_name: str = "gene",
     x_layer_name: str = "row_raw",
     raw_x_layer_name: str = "row_raw",
-    context: tiledbsoma.SOMATileDBContext = SOMA_TileDB_Context(),
+    context: Optional[tiledbsoma.SOMATileDBContext] = None,
 ) -> bool:
+    context = context or SOMA_TileDB_Context()
     try:
         logger.info(f"Worker ingesting file: {h5ad_path}")
 
@@ -177,6 +297,7 @@ def _ingest_h5ad_soma(
         logger.error(f"Failed to ingest {h5ad_path}, error: {ex}")
         raise Exception(f"{ex}")
 
+
 def compute_presence_matrix(
     sample_idx: int,
     sample_name: str,
@@ -205,4 +326,34 @@ def compute_presence_matrix(
     except Exception as e:
         print(e)
         logger.info(f"Error computing presence matrix for {sample_name} {study_name}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def init_presence_worker(
+    log_level: int,
+    log_queue: multiprocessing.Queue,
+    collection: Union[MtxCollection, H5adCollection],
+    global_var_list: List[str],
+):
+    """
+    Worker initializer for `compute_presence_matrix_task`. The collection and gene list are sent once per
+    worker process here instead of being pickled into every task.
+    """
+    init_worker_queue_logging(log_level, log_queue)
+    _PRESENCE_WORKER_STATE["collection"] = collection
+    _PRESENCE_WORKER_STATE["global_var_list"] = global_var_list
+
+
+def compute_presence_matrix_task(
+    sample_idx: int, sample_name: str, study_name: str, pai_presence_matrix_name: str, exp_uri: str
+):
+    """`compute_presence_matrix` with the collection and gene list set by `init_presence_worker`."""
+    return compute_presence_matrix(
+        sample_idx,
+        sample_name,
+        study_name,
+        _PRESENCE_WORKER_STATE["collection"],
+        _PRESENCE_WORKER_STATE["global_var_list"],
+        pai_presence_matrix_name,
+        exp_uri,
+    )
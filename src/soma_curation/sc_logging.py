@@ -1,6 +1,10 @@
 import logging
+import multiprocessing
 
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from multiprocessing.context import BaseContext
+from typing import Optional, Tuple
 
 # Create a logger
 logger = logging.getLogger("soma_curation")
@@ -107,5 +111,35 @@ def init_worker_logging(log_level: int, log_dir: str, log_file: str):
     logger.addHandler(fh)
 
 
+def start_log_listener(context: Optional[BaseContext] = None) -> Tuple[multiprocessing.Queue, QueueListener]:
+    """
+    Called once in the main process, after its handlers are configured. Starts a listener thread that hands
+    records put on the returned queue to the main process' handlers, so workers never touch the log file.
+
+    Parameters:
+    - context (Optional[BaseContext]): Multiprocessing context the workers are started with; the queue must be
+      created in the same one. Defaults to the global context
+
+    Returns:
+    - Tuple[multiprocessing.Queue, QueueListener]: Queue to pass to `init_worker_queue_logging` and the listener,
+      which should be stopped once the workers are done
+    """
+    queue = (context or multiprocessing).Queue(-1)
+    listener = QueueListener(queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+    return queue, listener
+
+
+def init_worker_queue_logging(log_level: int, queue: multiprocessing.Queue):
+    """
+    Called once per worker process. Sends all records to the main process' listener through `queue`
+    instead of writing to the log file from every worker.
+    """
+    logger.setLevel(log_level)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(queue))
+
+
 # Initialize logging with a default level (optional)
 configure_logging(logging.WARNING)
@@ -1,6 +1,59 @@
 from typing import List, Tuple, Dict, Any
 import pyarrow as pa
 
+# Filter pipelines used by several of the configs below
+_ZSTD9 = {"_type": "ZstdFilter", "level": 9}
+_ZSTD5 = {"_type": "ZstdFilter", "level": 5}
+_BS_ZSTD9 = ["ByteShuffleFilter", _ZSTD9]
+_DD_ZSTD9 = ["DoubleDeltaFilter", _ZSTD9]
+_SOMA_DATA_ATTRS = {"soma_data": {"filters": [_ZSTD5]}}
+
+# The raw and normalised X layers share their storage layout, so each orientation is defined once
+# and referenced by both layers. Schema loading clones the defaults before anything is mutated.
+_COL_MAJOR_X_CFG = {
+    "tiledb": {
+        "create": {
+            "capacity": 131072,
+            "dims": {
+                "soma_dim_0": {
+                    "tile": 262144,
+                    "filters": _BS_ZSTD9,
+                },
+                "soma_dim_1": {
+                    "tile": 1,
+                    "filters": _BS_ZSTD9,
+                },
+            },
+            "attrs": _SOMA_DATA_ATTRS,
+            "cell_order": "col-major",
+            "tile_order": "col-major",
+            "allows_duplicates": False,
+        }
+    }
+}
+
+_ROW_MAJOR_X_CFG = {
+    "tiledb": {
+        "create": {
+            "capacity": 131072,
+            "dims": {
+                "soma_dim_0": {
+                    "tile": 1,
+                    "filters": _BS_ZSTD9,
+                },
+                "soma_dim_1": {
+                    "tile": 35804,
+                    "filters": _BS_ZSTD9,
+                },
+            },
+            "attrs": _SOMA_DATA_ATTRS,
+            "cell_order": "row-major",
+            "tile_order": "row-major",
+            "allows_duplicates": False,
+        }
+    }
+}
+
 DEFAULT_DATABASE_SCHEMA_DICT = {
     "PAI_SCHEMA_VERSION": "1.0.0",
     "MEASUREMENT_RNA_NAME": "RNA",
@@ -46,13 +99,14 @@ DEFAULT_DATABASE_SCHEMA_DICT = {
         "umap": "float32",
     },
     "PAI_PRESENCE_LAYER": "uint8",
+    "X_DTYPE": "float32",
     "PAI_OBS_PLATFORM_CONFIG": {
         "tiledb": {
             "create": {
                 "capacity": 16384,
                 "tile_order": "row-major",
                 "cell_order": "row-major",
-                "offsets_filters": ["DoubleDeltaFilter", {"_type": "ZstdFilter", "level": 9}],
+                "offsets_filters": _DD_ZSTD9,
                 "allows_duplicates": False,
             }
         }
@@ -61,7 +115,7 @@ DEFAULT_DATABASE_SCHEMA_DICT = {
         "tiledb": {
             "create": {
                 "capacity": 131072,
-                "offsets_filters": ["DoubleDeltaFilter", {"_type": "ZstdFilter", "level": 9}],
+                "offsets_filters": _DD_ZSTD9,
                 "allows_duplicates": False,
             }
         }
@@ -72,90 +126,10 @@ DEFAULT_DATABASE_SCHEMA_DICT = {
         "GENE_INTERSECTION_THRESHOLD_FRAC": 0.0,
     },
     "PAI_X_LAYERS_PLATFORM_CONFIG": {
-        "col_raw": {
-            "tiledb": {
-                "create": {
-                    "capacity": 131072,
-                    "dims": {
-                        "soma_dim_0": {
-                            "tile": 262144,
-                            "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
-                        },
-                        "soma_dim_1": {
-                            "tile": 1,
-                            "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
-                        },
-                    },
-                    "attrs": {"soma_data": {"filters": [{"_type": "ZstdFilter", "level": 5}]}},
-                    "cell_order": "col-major",
-                    "tile_order": "col-major",
-                    "allows_duplicates": False,
-                }
-            }
-        },
-        "col_norm": {
-            "tiledb": {
-                "create": {
-                    "capacity": 131072,
-                    "dims": {
-                        "soma_dim_0": {
-                            "tile": 262144,
-                            "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
-                        },
-                        "soma_dim_1": {
-                            "tile": 1,
-                            "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
-                        },
-                    },
-                    "attrs": {"soma_data": {"filters": [{"_type": "ZstdFilter", "level": 5}]}},
-                    "cell_order": "col-major",
-                    "tile_order": "col-major",
-                    "allows_duplicates": False,
-                }
-            }
-        },
-        "row_raw": {
-            "tiledb": {
-                "create": {
-                    "capacity": 131072,
-                    "dims": {
-                        "soma_dim_0": {
-                            "tile": 1,
-                            "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
-                        },
-                        "soma_dim_1": {
-                            "tile": 35804,
-                            "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
-                        },
-                    },
-                    "attrs": {"soma_data": {"filters": [{"_type": "ZstdFilter", "level": 5}]}},
-                    "cell_order": "row-major",
-                    "tile_order": "row-major",
-                    "allows_duplicates": False,
-                }
-            }
-        },
-        "row_norm": {
-            "tiledb": {
-                "create": {
-                    "capacity": 131072,
-                    "dims": {
-                        "soma_dim_0": {
-                            "tile": 1,
-                            "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
-                        },
-                        "soma_dim_1": {
-                            "tile": 35804,
-                            "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
-                        },
-                    },
-                    "attrs": {"soma_data": {"filters": [{"_type": "ZstdFilter", "level": 5}]}},
-                    "cell_order": "row-major",
-                    "tile_order": "row-major",
-                    "allows_duplicates": False,
-                }
-            }
-        },
+        "col_raw": _COL_MAJOR_X_CFG,
+        "col_norm": _COL_MAJOR_X_CFG,
+        "row_raw": _ROW_MAJOR_X_CFG,
+        "row_norm": _ROW_MAJOR_X_CFG,
     },
     "PAI_PRESENCE_PLATFORM_CONFIG": {
         "tiledb": {
@@ -164,11 +138,11 @@ DEFAULT_DATABASE_SCHEMA_DICT = {
                 "dims": {
                     "soma_dim_0": {
                         "tile": 1,
-                        "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
+                        "filters": _BS_ZSTD9,
                     },
                     "soma_dim_1": {
                         "tile": 35804,
-                        "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}],
+                        "filters": _BS_ZSTD9,
                     },
                 },
                 "cell_order": "row-major",
@@ -1,29 +1,135 @@
-import yaml
+import copy
+import hashlib
 import importlib
+import json
+import os
 
-from cloudpathlib import AnyPath
+from functools import lru_cache
+from types import MappingProxyType
+from cloudpathlib import AnyPath, CloudPath
+from cloudpathlib.exceptions import CloudPathException
 from typing import Optional, Dict, Any
 
 from .objects import DatabaseSchema, ValidationSchema, convert_types
 from .defaults import DEFAULT_DATABASE_SCHEMA_DICT
 from ..sc_logging import logger
+from ..utils.cache import cache_dir
+
+
+def _freeze(obj: Any, memo: Optional[Dict[int, Any]] = None) -> Any:
+    """
+    Wrap every nested dict in a read-only `MappingProxyType`.
+
+    Containers referenced more than once (e.g. the shared X layer templates) are frozen once and stay shared,
+    which is safe because the result is read-only.
+    """
+    if memo is None:
+        memo = {}
+    obj_type = type(obj)
+    if obj_type is dict or obj_type is list:
+        frozen = memo.get(id(obj))
+        if frozen is None:
+            if obj_type is dict:
+                frozen = MappingProxyType({k: _freeze(v, memo) for k, v in obj.items()})
+            else:
+                frozen = [_freeze(v, memo) for v in obj]
+            memo[id(obj)] = frozen
+        return frozen
+    return obj
+
+
+def _thaw(obj: Any) -> Any:
+    """
+    Copy the containers of a (frozen) nested structure into plain dicts and lists.
+
+    Leaves (strings, numbers, tuples, pyarrow types) are immutable and shared rather than copied,
+    which makes this much cheaper than `copy.deepcopy`. Shared containers are deliberately unshared here:
+    overrides are merged in place, so e.g. a `row_raw` override must not leak into `row_norm`.
+    """
+    obj_type = type(obj)
+    if obj_type is MappingProxyType or obj_type is dict:
+        return {k: _thaw(v) for k, v in obj.items()}
+    if obj_type is list:
+        return [_thaw(v) for v in obj]
+    return obj
+
+
+# The defaults are static, so their string types are converted to pyarrow dtypes once at import.
+# The result is frozen; each schema build thaws its own mutable copy
+_CONVERTED_DEFAULTS = _freeze(convert_types(copy.deepcopy(DEFAULT_DATABASE_SCHEMA_DICT)))
+_DEFAULT_VALIDATION_SCHEMA = ValidationSchema(**DEFAULT_DATABASE_SCHEMA_DICT["VALIDATION_SCHEMA"])
+
+
+@lru_cache(maxsize=1)
+def _yaml_loader() -> type:
+    """
+    Import PyYAML on first use and pick its loader. The default schema is a Python literal, so
+    YAML is only needed when a user schema file is given.
+
+    libyaml's C scanner is much faster than the pure-Python loader; fall back to the latter if it wasn't built.
+    """
+    import yaml
+
+    try:
+        return yaml.CSafeLoader
+    except AttributeError:  # pragma: no cover - depends on how PyYAML was built
+        logger.warning("PyYAML was built without libyaml, schema files will be parsed with the pure-Python loader.")
+        return yaml.SafeLoader
+
+
+def _read_user_schema(db_path: AnyPath) -> Any:
+    """
+    Parse a user schema YAML file, going through a JSON cache keyed on the hash of its contents.
+
+    The cached document is the parsed YAML before type conversion and merging, so it stays valid
+    across pyarrow and default schema changes. Documents that don't survive a JSON round trip
+    (e.g. non-string keys) are never cached, and cache I/O failures only cost the cache.
+    """
+    raw = db_path.read_bytes()
+    cache_path = cache_dir() / f"schema-{hashlib.blake2b(raw, digest_size=16).hexdigest()}.json"
+
+    try:
+        with cache_path.open("r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    import yaml
+
+    user_db_dict = yaml.load(raw, Loader=_yaml_loader())
+
+    try:
+        serialized = json.dumps(user_db_dict)
+        if json.loads(serialized) == user_db_dict:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(serialized)
+            os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not cache parsed schema %s: %s", db_path, e)
+
+    return user_db_dict
 
 
 def deep_merge_dict(orig: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Recursively merges 'override' into 'orig'.
+    Merges 'override' into 'orig' in place, walking nested dicts with an explicit stack.
       - If both orig[k] and override[k] are dicts, merge them.
       - Otherwise override orig[k] with override[k].
     """
-    for k, v in override.items():
-        if k in orig and isinstance(orig[k], dict) and isinstance(v, dict):
-            deep_merge_dict(orig[k], v)
-        else:
-            orig[k] = v
+    stack = [(orig, override)]
+    while stack:
+        target, source = stack.pop()
+        for k, v in source.items():
+            current = target.get(k)
+            if type(current) is dict and type(v) is dict:
+                stack.append((current, v))
+            else:
+                target[k] = v
     return orig
 
 
-def load_schema(db_config_uri: Optional[str] = None) -> DatabaseSchema:
+def load_schema(db_config_uri: Optional[str] = None, mutable: bool = False, trusted: bool = False) -> DatabaseSchema:
     """
     Load a minimal or full DatabaseSchema YAML from a local file, S3, GCS, or Azure,
     merge it with your defaults, and return a DatabaseSchema object.
@@ -31,35 +137,79 @@ def load_schema(db_config_uri: Optional[str] = None) -> DatabaseSchema:
     If `db_config_uri` is None or empty, no user overrides are read, and the default
     database schema is used.
 
-    If `validation_config_uri` is provided, merges that YAML with the default
-    validation dictionary. Otherwise uses the default validation schema.
+    User values override the defaults; the default validation schema is always used.
+
+    Schemas are parsed once per URI and modification time, and the same instance is returned on later
+    calls while the file is unchanged. Pass `mutable=True` to get a private deep copy that is safe to modify.
+
+    Pass `trusted=True` to skip field validation of a schema file that is known to be valid, e.g. one that
+    already loaded fine elsewhere. The defaults alone are always treated as trusted.
+    """
+    db_config_uri = _normalize_uri(db_config_uri)
+    schema = _load_schema_cached(db_config_uri, _modification_stamp(db_config_uri), trusted)
+    return copy.deepcopy(schema) if mutable else schema
+
+
+def _normalize_uri(db_config_uri: Optional[str]) -> Optional[str]:
+    """Make local paths absolute, so relative and absolute spellings of one file share a cache entry."""
+    if not db_config_uri:
+        return None
+    path = AnyPath(db_config_uri)
+    return db_config_uri if isinstance(path, CloudPath) else os.path.abspath(db_config_uri)
+
+
+def _modification_stamp(db_config_uri: Optional[str]) -> Optional[int]:
+    """Modification time of the schema file in ns, or None when there is none or it can't be read."""
+    if db_config_uri is None:
+        return None
+    try:
+        stat = AnyPath(db_config_uri).stat()
+        # Cloud stats only carry float seconds
+        return getattr(stat, "st_mtime_ns", None) or int(stat.st_mtime * 1e9)
+    except (OSError, ValueError, CloudPathException):
+        # Let the actual read report the problem
+        return None
+
+
+@lru_cache(maxsize=32)
+def _load_schema_cached(
+    db_config_uri: Optional[str], modification_stamp: Optional[int], trusted: bool = False
+) -> DatabaseSchema:
+    """
+    Build the DatabaseSchema for `db_config_uri`, memoised by `load_schema`.
+    `modification_stamp` is only part of the cache key, so an edited file is parsed again.
     """
 
     # 1. Load the user’s “database” config if db_config_uri is provided and non-empty
     if db_config_uri:
-        db_path = AnyPath(db_config_uri)
-        with db_path.open("r") as f:
-            user_db_dict = yaml.safe_load(f)
+        user_db_dict = _read_user_schema(AnyPath(db_config_uri))
         if not isinstance(user_db_dict, dict):
             raise ValueError(f"Invalid DB schema at {db_config_uri}")
     else:
         # No user DB config => no overrides
         user_db_dict = {}
 
-    # 2. Merge user’s partial dictionary with your default DB schema
-    merged_db_dict = deep_merge_dict(DEFAULT_DATABASE_SCHEMA_DICT.copy(), user_db_dict)
-
-    # 3. Build ValidationSchema object
-    merged_db_dict["VALIDATION_SCHEMA"] = ValidationSchema(**DEFAULT_DATABASE_SCHEMA_DICT["VALIDATION_SCHEMA"])
+    # 2. Convert string types to pyarrow dtypes. Defaults are converted once at import, so only overrides remain
+    # 3. Merge user’s partial dictionary with your default DB schema
+    if user_db_dict:
+        merged_db_dict = deep_merge_dict(_thaw(_CONVERTED_DEFAULTS), convert_types(user_db_dict))
+    else:
+        merged_db_dict = _thaw(_CONVERTED_DEFAULTS)
 
-    # 4. Convert string types to pyarrow dtypes
-    convert_types(merged_db_dict)
+    # 4. Build ValidationSchema object
+    merged_db_dict["VALIDATION_SCHEMA"] = _DEFAULT_VALIDATION_SCHEMA
 
     # 5. Default core gene set path if not set
     if merged_db_dict["CORE_GENE_SET_PATH"] is None:
         logger.warning("CORE_GENE_SET_PATH is null or missing. Using dummy_core_geneset.tsv.gz instead.")
-        core_gene_set_path = importlib.resources.files("soma_curation.constants").joinpath("dummy_core_geneset.tsv.gz")
+        # Resolve from the top-level package: importing `soma_curation.constants` would pull in anndata and pandas
+        core_gene_set_path = importlib.resources.files("soma_curation").joinpath(
+            "constants", "dummy_core_geneset.tsv.gz"
+        )
         merged_db_dict["CORE_GENE_SET_PATH"] = str(core_gene_set_path)
 
-    # 6. Instantiate your DatabaseSchema
+    # 6. Instantiate your DatabaseSchema. Without user overrides everything comes from the trusted, already
+    # converted defaults, so validation is skipped
+    if trusted or not user_db_dict:
+        return DatabaseSchema.trusted_construct(merged_db_dict)
     return DatabaseSchema(**merged_db_dict)
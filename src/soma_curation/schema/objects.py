@@ -1,13 +1,221 @@
 import pyarrow as pa
-import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import numpy as np
+import hashlib
 import importlib
+import os
+import sys
 
+from cloudpathlib import AnyPath, CloudPath
+from cloudpathlib.exceptions import CloudPathException
 from pydantic import BaseModel, ConfigDict, Field, computed_field
-from functools import cached_property
-from typing import Dict, Any, List, Literal, Set, Tuple
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Any, FrozenSet, List, Literal, Optional, Tuple
+
+from ..sc_logging import logger
+from ..utils.cache import cache_dir
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Filter specs shared by every column they apply to; the pipelines are tuples, treat the dicts as read-only too
+_ZSTD9 = {"_type": "ZstdFilter", "level": 9}
+_INT_DIM_FILTERS = {"filters": ("DoubleDeltaFilter", _ZSTD9)}
+_NUMERIC_ATTR_FILTERS = {"filters": ("ByteShuffleFilter", _ZSTD9)}
+_DICTIONARY_ATTR_FILTERS = {"filters": (_ZSTD9,)}
+_STRING_ATTR_FILTERS = {"filters": (_ZSTD9,)}
+
+
+def _read_gene_column(path: AnyPath) -> pa.Array:
+    """
+    Read the first column of a gene list: a header-less, optionally gzipped, TSV read with Arrow's multi-threaded
+    CSV reader, or a Feather/Arrow IPC file. The format is detected from the magic bytes rather than the extension.
+    """
+    if isinstance(path, CloudPath):
+        source = pa.BufferReader(path.read_bytes())
+    else:
+        source = pa.memory_map(str(path))
+    magic = source.read(6)
+    source.seek(0)
+
+    if magic == b"ARROW1":
+        return pa.ipc.open_file(source).read_all().column(0).cast(pa.large_string()).combine_chunks()
+    if magic[:2] == b"\x1f\x8b":
+        source = pa.CompressedInputStream(source, "gzip")
+
+    with source:
+        table = pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+            parse_options=pacsv.ParseOptions(delimiter="\t", quote_char=False),
+            convert_options=pacsv.ConvertOptions(include_columns=["f0"], column_types={"f0": pa.large_string()}),
+        )
+    return table.column(0).combine_chunks()
+
+
+def _gene_set_key(path: str) -> Tuple[str, Optional[Tuple[int, float]]]:
+    """
+    Cache key for the values derived from a gene set: its location, plus its size and modification time
+    (None when it can't be read), so a rewritten file is read again.
+    """
+    try:
+        stat = AnyPath(path).stat()
+    except (OSError, CloudPathException):
+        return path, None
+    return path, (stat.st_size, stat.st_mtime)
+
+
+def _gene_cache_path(path: str, stamp: Optional[Tuple[int, float]]) -> Optional[Path]:
+    """Arrow IPC cache file for a gene set, keyed on its location, size and modification time."""
+    if stamp is None:
+        return None
+    key = f"{path}:{stamp[0]}:{stamp[1]}".encode()
+    return cache_dir() / f"genes-{hashlib.blake2b(key, digest_size=16).hexdigest()}.arrow"
+
+
+# The gene set derived values only depend on the file, so they are shared by every schema pointing at it.
+# Treat the cached objects, including the var dataframe, as read-only
+@lru_cache(maxsize=8)
+def _sorted_core_genes_array(path: str, stamp: Optional[Tuple[int, float]]) -> pa.LargeStringArray:
+    """
+    Unique, sorted genes of a gene set file. The result is cached as an Arrow IPC file, so later processes
+    memory-map it instead of parsing and sorting the TSV again. Cache I/O failures only cost the cache.
+    `stamp` comes from `_gene_set_key` and is only part of the cache key.
+    """
+    gene_path = AnyPath(path)
+    cache_path = _gene_cache_path(path, stamp)
+
+    if cache_path is not None:
+        try:
+            return pa.ipc.open_file(pa.memory_map(str(cache_path))).read_all().column("gene").combine_chunks()
+        except (OSError, pa.ArrowInvalid, KeyError):
+            pass
+
+    genes = pc.unique(_read_gene_column(gene_path))
+    genes = genes.take(pc.sort_indices(genes))
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            table = pa.table({"gene": genes})
+            with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.debug("Could not cache gene set %s: %s", path, e)
+
+    return genes
+
+
+# The sorted tuple is the canonical Python view; the set is built from it and so holds the same string objects.
+# Interning lets lookups of other interned gene names short-circuit on identity
+@lru_cache(maxsize=8)
+def _sorted_core_genes(path: str, stamp: Optional[Tuple[int, float]]) -> Tuple[str, ...]:
+    return tuple(map(sys.intern, _sorted_core_genes_array(path, stamp).to_pylist()))
+
+
+@lru_cache(maxsize=8)
+def _core_gene_set(path: str, stamp: Optional[Tuple[int, float]]) -> FrozenSet[str]:
+    return frozenset(_sorted_core_genes(path, stamp))
+
+
+@lru_cache(maxsize=8)
+def _var_table(path: str, stamp: Optional[Tuple[int, float]]) -> pa.Table:
+    # `gene` and `ens` share one Arrow array
+    genes = _sorted_core_genes_array(path, stamp)
+    return pa.table(
+        {
+            "gene": genes,
+            "soma_joinid": pa.array(np.arange(len(genes), dtype=np.int64)),
+            "ens": genes,
+        }
+    )
+
+
+@lru_cache(maxsize=8)
+def _var_df(path: str, stamp: Optional[Tuple[int, float]]) -> "pd.DataFrame":
+    # The conversion reuses the same Python strings for `gene` and `ens`
+    return _var_table(path, stamp).to_pandas()
+
+
+@lru_cache(maxsize=None)
+def _standardize_function(name: str) -> Callable:
+    """Look up a computed column function by name, importing `dataset.standardize` on first use only."""
+    module = importlib.import_module("..dataset.standardize", package=__package__)
+    return getattr(module, name)
+
+
+class _LazyFunction:
+    """
+    Stand-in for a `dataset.standardize` function that only imports it when first called.
+    Compares equal by name, and pickles as its name.
+    """
+
+    def __init__(self, name: str):
+        self.__name__ = name
+
+    def __call__(self, *args, **kwargs):
+        return _standardize_function(self.__name__)(*args, **kwargs)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _LazyFunction) and other.__name__ == self.__name__
+
+    def __hash__(self) -> int:
+        return hash(self.__name__)
+
+    def __repr__(self) -> str:
+        return f"_LazyFunction({self.__name__!r})"
+
+    def __reduce__(self):
+        return _LazyFunction, (self.__name__,)
+
+
+@lru_cache(maxsize=None)
+def _filter_spec_table(
+    term_columns: Tuple[Tuple[str, pa.DataType], ...], index: Tuple[Tuple[str, pa.DataType], ...]
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Build the per-column `dims` and `attrs` filter specs for a layer. The table only depends on the
+    column names and types, so it is computed once per distinct column layout and shared afterwards.
+
+    Returns:
+    - Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]
+        The `dims` and `attrs` filter specs, keyed by column name. Treat as read-only.
+
+    Raises:
+    - ValueError
+        If the dimensional attributes are not integers.
+    """
+    is_integer, is_floating, is_dictionary = pa.types.is_integer, pa.types.is_floating, pa.types.is_dictionary
+    dims, attrs = {}, {}
+
+    index_names = frozenset(name for name, _ in index)
+
+    for column, dtype in term_columns:
+        if column in index_names:
+            if is_integer(dtype):
+                dims[column] = _INT_DIM_FILTERS
+            else:
+                raise ValueError("Set dimensional attributes to integers. Other data types are not efficient")
+        # Numeric
+        elif is_integer(dtype) or is_floating(dtype):
+            attrs[column] = _NUMERIC_ATTR_FILTERS
+        # Dictionary
+        elif is_dictionary(dtype):
+            attrs[column] = _DICTIONARY_ATTR_FILTERS
+        else:
+            attrs[column] = _STRING_ATTR_FILTERS
+
+    return dims, attrs
 
 
 class ValidationSchema(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     REQUIRED_OBS_COLUMNS: List[str]
     REQUIRED_VAR_COLUMNS: List[str]
     GENE_INTERSECTION_THRESHOLD_FRAC: float
@@ -46,6 +254,8 @@ class DatabaseSchema(BaseModel):
         Tuple of observation matrix index columns and their data types.
     - PAI_PRESENCE_LAYER: pa.DataType
         Data type of the presence layer.
+    - X_DTYPE: pa.DataType
+        Data type raw count matrices are read into (e.g. uint16/int32 for raw UMI counts).
     - PAI_OBS_PLATFORM_CONFIG: Dict[str, Dict[str, Dict[str, Any]]]
         Platform configuration for observation columns.
     - PAI_VAR_PLATFORM_CONFIG: Dict[str, Dict[str, Dict[str, Any]]]
@@ -64,7 +274,7 @@ class DatabaseSchema(BaseModel):
     - apply_filters: Apply filters to observation and variable columns based on their data types.
 
     Properties:
-    - CORE_GENES: set
+    - CORE_GENES: FrozenSet[str]
         Set of core genes loaded from the core gene set file.
     """
 
@@ -86,6 +296,7 @@ class DatabaseSchema(BaseModel):
     PAI_X_LAYERS: List[Tuple[str, pa.DataType]]
     PAI_OBSM_INDEX_COLUMN: List[Tuple[str, pa.DataType]]
     PAI_PRESENCE_LAYER: pa.DataType
+    X_DTYPE: pa.DataType = Field(default=pa.float32(), repr=False)
 
     # Platform configs for creation
     PAI_OBS_PLATFORM_CONFIG: Dict[str, Dict[str, Dict[str, Any]]] = Field(repr=False)
@@ -97,7 +308,28 @@ class DatabaseSchema(BaseModel):
 
     VALIDATION_SCHEMA: ValidationSchema = Field(repr=False)
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    # Fields can't be reassigned once built, so a cached schema can be shared safely; the post-init hook only fills
+    # in the nested platform config and function dicts
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True, validate_assignment=False)
+
+    @classmethod
+    def trusted_construct(cls, data: Dict[str, Any]) -> "DatabaseSchema":
+        """
+        Build a schema from already type-converted data without running field validation.
+        `model_construct` still runs `model_post_init`, so filters and computed column functions are set up.
+
+        Only use this for data that is known to be valid, e.g. the defaults or a schema file that has been
+        validated before; invalid values are not caught here and fail later instead.
+
+        Parameters:
+        - data: Dict[str, Any]
+            Field values, with types already converted by `convert_types`.
+
+        Returns:
+        - DatabaseSchema
+            The constructed schema.
+        """
+        return cls.model_construct(**data)
 
     def model_post_init(self, ctx):
         """
@@ -107,7 +339,8 @@ class DatabaseSchema(BaseModel):
         - ctx: Context
             The context in which the model is initialized.
         """
-        [self.apply_filters(l) for l in ["obs", "var"]]
+        self.apply_filters("obs")
+        self.apply_filters("var")
         self.fetch_and_functions()
 
     def get_column_names(self, columns: List[Tuple[str, pa.DataType]]) -> List[str]:
@@ -118,14 +351,15 @@ class DatabaseSchema(BaseModel):
 
     def fetch_and_functions(self):
         """
-        Fetch and set functions for computed columns from the specified module.
+        Fetch and set functions for computed columns from the specified module. The functions are bound lazily,
+        so `dataset.standardize` and its dependencies are only imported once a computed column is applied.
         """
-        module = importlib.import_module("soma_curation.dataset.standardize", package=__package__)
-
+        functions = self.COMPUTED_COLUMN_FUNCTIONS
         for col, _ in self.PAI_OBS_COMPUTED_COLUMNS:
-            func = getattr(module, self.COMPUTED_COLUMN_FUNCTIONS[col])
-
-            self.COMPUTED_COLUMN_FUNCTIONS[col] = func
+            func = functions[col]
+            # Already resolved, e.g. if the hook runs again on a copied schema
+            if not callable(func):
+                functions[col] = _LazyFunction(func)
 
     def apply_filters(self, layer: Literal["obs", "var"]):
         """
@@ -139,54 +373,26 @@ class DatabaseSchema(BaseModel):
         - ValueError
             If the dimensional attributes are not integers.
         """
-        layer_mapping = {
-            "obs": {
-                "index": self.PAI_OBS_INDEX_COLUMNS,
-                "platform_config": self.PAI_OBS_PLATFORM_CONFIG,
-                "term_columns": self.PAI_OBS_TERM_COLUMNS,
-            },
-            "var": {
-                "index": self.PAI_OBS_INDEX_COLUMNS,
-                "platform_config": self.PAI_VAR_PLATFORM_CONFIG,
-                "term_columns": self.PAI_VAR_TERM_COLUMNS,
-            },
-        }
-
-        layer_index: List[Tuple[str, pa.DataType]] = layer_mapping[layer]["index"]
-        layer_term_columns: List[Tuple[str, pa.DataType]] = layer_mapping[layer]["term_columns"]
-        layer_platform_config: Dict[str, Dict[str, Dict[str, Any]]] = layer_mapping[layer]["platform_config"]
-
-        for column, dtype in layer_term_columns:
-            if column in layer_index:
-                dim_attr_key = "dims"
-                if dim_attr_key not in layer_platform_config["tiledb"]["create"]:
-                    layer_platform_config["tiledb"]["create"][dim_attr_key] = {}
-
-                if pa.types.is_integer(dtype):
-                    layer_platform_config["tiledb"]["create"][dim_attr_key][column] = {
-                        "filters": ["DoubleDeltaFilter", {"_type": "ZstdFilter", "level": 9}]
-                    }
-                else:
-                    raise ValueError("Set dimensional attributes to integers. Other data types are not efficient")
-            else:
-                dim_attr_key = "attrs"
-                if dim_attr_key not in layer_platform_config["tiledb"]["create"]:
-                    layer_platform_config["tiledb"]["create"][dim_attr_key] = {}
-
-                # Numeric
-                if pa.types.is_integer(dtype) or pa.types.is_floating(dtype):
-                    layer_platform_config["tiledb"]["create"][dim_attr_key][column] = {
-                        "filters": ["ByteShuffleFilter", {"_type": "ZstdFilter", "level": 9}]
-                    }
-                # Dictionary
-                elif pa.types.is_dictionary(dtype):
-                    layer_platform_config["tiledb"]["create"][dim_attr_key][column] = {
-                        "filters": [{"_type": "ZstdFilter", "level": 9}]
-                    }
-                else:
-                    layer_platform_config["tiledb"]["create"][dim_attr_key][column] = {
-                        "filters": [{"_type": "ZstdFilter", "level": 9}]
-                    }
+        # Only touch the requested layer's fields, so the other layer's term columns aren't built as a side effect
+        if layer == "obs":
+            layer_index = self.PAI_OBS_INDEX_COLUMNS
+            layer_term_columns = self.PAI_OBS_TERM_COLUMNS
+            layer_platform_config = self.PAI_OBS_PLATFORM_CONFIG
+        elif layer == "var":
+            layer_index = self.PAI_VAR_INDEX_COLUMNS
+            layer_term_columns = self.PAI_VAR_TERM_COLUMNS
+            layer_platform_config = self.PAI_VAR_PLATFORM_CONFIG
+        else:
+            raise ValueError(f"Unknown layer {layer!r}, expected 'obs' or 'var'")
+
+        dims, attrs = _filter_spec_table(tuple(layer_term_columns), tuple(layer_index))
+
+        # User configs may omit the nested sections, so create them on demand
+        create = layer_platform_config.setdefault("tiledb", {}).setdefault("create", {})
+        if dims:
+            create.setdefault("dims", {}).update(dims)
+        if attrs:
+            create.setdefault("attrs", {}).update(attrs)
 
     @computed_field(repr=False)
     @cached_property
@@ -205,27 +411,38 @@ class DatabaseSchema(BaseModel):
 
     @computed_field(repr=False)
     @cached_property
-    def CORE_GENES(self) -> Set[str]:
+    def CORE_GENES(self) -> FrozenSet[str]:
         """
         Load and return the core genes from the core gene set file.
 
         Returns:
-        - set
+        - FrozenSet[str]
             Set of core genes.
         """
-        return set(pd.read_csv(self.CORE_GENE_SET_PATH, sep="\t", header=None)[0])
+        return _core_gene_set(*_gene_set_key(self.CORE_GENE_SET_PATH))
 
     @computed_field(repr=False)
     @cached_property
-    def SORTED_CORE_GENES(self) -> List[str]:
+    def SORTED_CORE_GENES(self) -> Tuple[str, ...]:
         """
         Return the sorted core genes.
 
         Returns:
-        - List[str]
-            Set of sorted core genes.
+        - Tuple[str, ...]
+            Immutable, sorted core genes.
+        """
+        return _sorted_core_genes(*_gene_set_key(self.CORE_GENE_SET_PATH))
+
+    @cached_property
+    def SORTED_CORE_GENES_ARRAY(self) -> pa.LargeStringArray:
         """
-        return sorted(self.CORE_GENES)
+        Return the sorted core genes as an Arrow array, sorted by Arrow's sort kernel rather than Python's `sorted`.
+
+        Returns:
+        - pa.LargeStringArray
+            Sorted core genes.
+        """
+        return _sorted_core_genes_array(*_gene_set_key(self.CORE_GENE_SET_PATH))
 
     @computed_field(repr=False)
     @cached_property
@@ -239,75 +456,84 @@ class DatabaseSchema(BaseModel):
         """
         return len(self.SORTED_CORE_GENES)
 
-    @computed_field(repr=False)
     @cached_property
-    def VAR_DF(self) -> pd.DataFrame:
+    def VAR_TABLE(self) -> pa.Table:
+        """
+        Return the var table based on the core genes, as Arrow so it can be written without a pandas round trip.
+
+        Returns:
+        - pa.Table
+            Table of core genes, soma_joinid and ensembl.
+        """
+        return _var_table(*_gene_set_key(self.CORE_GENE_SET_PATH))
+
+    # pandas is only imported by `to_pandas` when the dataframe is first built, so the return type is given
+    # explicitly rather than resolved from the annotation
+    @computed_field(repr=False, return_type=Any)
+    @cached_property
+    def VAR_DF(self) -> "pd.DataFrame":
         """
         Load and return the var df based on the core genes.
 
         Returns:
         - pd.DataFrame
-            Dataframe of of core genes, soma_joinid and ensembl.
+            Dataframe of of core genes, soma_joinid and ensembl. Shared between schemas, do not modify in place.
         """
-        var_df = pd.DataFrame(
-            {
-                "gene": self.SORTED_CORE_GENES,
-                "soma_joinid": list(range(self.NUM_GENES)),
-                "ens": self.SORTED_CORE_GENES,
-            }
-        )
+        return _var_df(*_gene_set_key(self.CORE_GENE_SET_PATH))
 
-        return var_df
+
+_PYARROW_MAPPING = {
+    "large_string": pa.large_string(),
+    "categorical__large_string": pa.dictionary(pa.int32(), pa.large_string(), ordered=False),
+    "string": pa.string(),
+    "int64": pa.int64(),
+    "int32": pa.int32(),
+    "uint8": pa.uint8(),
+    "uint16": pa.uint16(),
+    "uint32": pa.uint32(),
+    "float32": pa.float32(),
+    "bool_": pa.bool_(),
+}
 
 
 def convert_types_in_list_of_tuples(tuples_list):
     """
     Given a list of (col_name, type_str), convert the type_str to a pyarrow dtype
-    if recognized, in place. Returns the same list object for convenience.
+    if recognized, in place. Pairs parsed from YAML/JSON as lists become tuples, as
+    validation would make them. Returns the same list object for convenience.
     """
-    pyarrow_mapping = {
-        "large_string": pa.large_string(),
-        "categorical__large_string": pa.dictionary(pa.int32(), pa.large_string(), ordered=False),
-        "string": pa.string(),
-        "int64": pa.int64(),
-        "int32": pa.int32(),
-        "uint8": pa.uint8(),
-        "uint32": pa.uint32(),
-        "float32": pa.float32(),
-        "bool_": pa.bool_(),
-    }
     for i, (col_name, type_str) in enumerate(tuples_list):
-        if isinstance(type_str, str) and type_str in pyarrow_mapping:
-            tuples_list[i] = (col_name, pyarrow_mapping[type_str])
+        if type(type_str) is str:
+            type_str = _PYARROW_MAPPING.get(type_str, type_str)
+        tuples_list[i] = (col_name, type_str)
     return tuples_list
 
 
-def convert_types(d: dict):
+def convert_types(d: dict) -> dict:
     """
-    Recursively convert:
-     - string data types in dictionary keys (like "int64" -> pa.int64())
+    Convert, in place and walking nested dicts iteratively:
+     - string data types in dictionary values (like "int64" -> pa.int64())
      - list of (col_name, type_str) => (col_name, pa.DataType)
+
+    Returns the same dict object for convenience.
     """
-    pyarrow_mapping = {
-        "large_string": pa.large_string(),
-        "categorical__large_string": pa.dictionary(pa.int32(), pa.large_string(), ordered=False),
-        "string": pa.string(),
-        "int64": pa.int64(),
-        "int32": pa.int32(),
-        "uint8": pa.uint8(),
-        "uint32": pa.uint32(),
-        "float32": pa.float32(),
-        "bool_": pa.bool_(),
-    }
-
-    for key, val in d.items():
-        # 1) If the value is a dict => recurse
-        if isinstance(val, dict):
-            convert_types(val)
-        # 2) If it's a list of 2-tuples => convert each second item
-        elif isinstance(val, list) and all(isinstance(item, (tuple, list)) and len(item) == 2 for item in val):
-            convert_types_in_list_of_tuples(val)
-        # 3) If it's a single string recognized in pyarrow_mapping => convert
-        elif isinstance(val, str) and val in pyarrow_mapping:
-            d[key] = pyarrow_mapping[val]
-        # Otherwise do nothing special
+    mapping = _PYARROW_MAPPING
+    stack = [d]
+    while stack:
+        current = stack.pop()
+        for key, val in current.items():
+            # The input comes from YAML/JSON or the defaults literal, so exact type checks are enough
+            val_type = type(val)
+            # 1) If the value is a dict => visit it later
+            if val_type is dict:
+                stack.append(val)
+            # 2) If it's a single string recognized in the mapping => convert
+            elif val_type is str:
+                mapped = mapping.get(val)
+                if mapped is not None:
+                    current[key] = mapped
+            # 3) If it's a list of 2-tuples => convert each second item
+            elif val_type is list and all(type(item) in (tuple, list) and len(item) == 2 for item in val):
+                convert_types_in_list_of_tuples(val)
+            # Otherwise do nothing special
+    return d
@@ -1,8 +1,8 @@
 # TODO: Investigate dense arrays for presence matrix # atlas/crud.py
 import argparse
 import tiledbsoma as soma
-import multiprocessing
 import pandas as pd
+import pyarrow as pa
 
 from typing import Tuple
 
@@ -10,12 +10,9 @@ from cloudpathlib import AnyPath
 
 from ..collection import MtxCollection, H5adCollection
 from ..schema import load_schema, DatabaseSchema
-from ..executor.executors import MultiprocessingExecutor
-from ..sc_logging import logger, _set_level, init_worker_logging
-from ..ingest.ingestion_funcs import compute_presence_matrix
-
-if multiprocessing.get_start_method(True) != "spawn":
-    multiprocessing.set_start_method("spawn", True)
+from ..executor.executors import MultiprocessingExecutor, get_worker_context
+from ..sc_logging import logger, _set_level, start_log_listener
+from ..ingest.ingestion_funcs import compute_presence_matrix_task, init_presence_worker
 
 
 def determine_sample_df_to_process(experiment_uri: str, schema: DatabaseSchema) -> Tuple[pd.DataFrame, int]:
@@ -33,22 +30,20 @@ def determine_sample_df_to_process(experiment_uri: str, schema: DatabaseSchema)
     exp = soma.Experiment.open(experiment_uri)
     cols = [c.name for c in exp.obs.schema]
     if "sample_idx" in cols:
-        sample_names_df = (
-            exp.obs.read(column_names=["sample_name", "study_name", "sample_idx"])
-            .concat()
-            .to_pandas()
-            .drop_duplicates()
-            .reset_index(drop=True)
-        )
+        obs_table = exp.obs.read(column_names=["sample_name", "study_name", "sample_idx"]).concat()
     else:
-        sample_names_df = (
-            exp.obs.read(column_names=["sample_name", "study_name"])
-            .concat()
-            .to_pandas()
-            .drop_duplicates()
-            .reset_index(drop=True)
+        # One dictionary across chunks, so the dictionary indices are the sample codes
+        obs_table = exp.obs.read(column_names=["sample_name", "study_name"]).concat().unify_dictionaries()
+        sample_names = obs_table.column("sample_name")
+        sample_codes = pa.chunked_array(
+            [chunk.indices for chunk in sample_names.chunks], type=sample_names.type.index_type
         )
-        sample_names_df["sample_idx"] = sample_names_df["sample_name"].cat.codes
+        obs_table = obs_table.append_column("sample_idx", sample_codes)
+
+    # Deduplicate in Arrow so only the unique samples are converted to pandas; unthreaded keeps first-seen order
+    sample_names_df = (
+        obs_table.group_by(["sample_name", "study_name", "sample_idx"], use_threads=False).aggregate([]).to_pandas()
+    )
     resize_length = sample_names_df["sample_idx"].max() + 1
     logger.info(
         f"Found {len(sample_names_df)} samples in SOMA experiment, going to resize presence matrix to {resize_length} rows"
@@ -61,7 +56,7 @@ def determine_sample_df_to_process(experiment_uri: str, schema: DatabaseSchema)
         sample_names_df = sample_names_df
     else:
         logger.info(f"Considering all sample idxs from {last_sample_idx + 1} to {resize_length - 1}")
-        sample_names_df = sample_names_df[~sample_names_df["sample_idx"].isin(range(last_sample_idx + 1))]
+        sample_names_df = sample_names_df[sample_names_df["sample_idx"] > last_sample_idx]
     return sample_names_df, resize_length
 
 
@@ -100,21 +95,28 @@ def main():
         exp.ms["RNA"][schema.PAI_PRESENCE_MATRIX_NAME].resize(presence_matrix_shape)
     logger.info("Resized presence matrix")
 
-    tasks_for_ingestion = [
-        (sidx, sample_name, study_name, collection, global_var_list, schema.PAI_PRESENCE_MATRIX_NAME, args.exp_uri)
+    # The collection and gene list reach each worker once through its initializer, tasks only name the sample
+    tasks_for_ingestion = (
+        (sidx, sample_name, study_name, schema.PAI_PRESENCE_MATRIX_NAME, args.exp_uri)
         for sidx, sample_name, study_name in zip(
             samples_to_generate_df["sample_idx"],
             samples_to_generate_df["sample_name"],
             samples_to_generate_df["study_name"],
         )
-    ]
-    logger.info(f"Running {len(tasks_for_ingestion)} tasks in parallel")
+    )
+    logger.info(f"Running {len(samples_to_generate_df)} tasks in parallel")
+    mp_context = get_worker_context()
+    log_queue, log_listener = start_log_listener(mp_context)
     mp_executor = MultiprocessingExecutor(
         processes=args.n_processes,
-        init_worker_logging=init_worker_logging,
-        init_args=(10, AnyPath("logs").as_posix(), "pipeline.log"),
+        init_worker_logging=init_presence_worker,
+        init_args=(10, log_queue, collection, global_var_list),
+        context=mp_context,
     )
-    ingest_result = mp_executor.run(tasks_for_ingestion, compute_presence_matrix)
+    try:
+        ingest_result = mp_executor.run(tasks_for_ingestion, compute_presence_matrix_task)
+    finally:
+        log_listener.stop()
     logger.info(
         f"Ingestion complete. {ingest_result.num_successes} successes, " f"{ingest_result.num_failures} failures."
     )
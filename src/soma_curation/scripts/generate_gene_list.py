@@ -1,36 +1,38 @@
 import argparse
 from pathlib import Path
 from cloudpathlib import AnyPath
-from typing import List, Set
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
 
-from ..sc_logging import logger, _set_level, init_worker_logging
+from ..sc_logging import logger, _set_level, init_worker_queue_logging, start_log_listener
 from ..collection import MtxCollection
-from ..executor.executors import MultiprocessingExecutor
+from ..executor.executors import MultiprocessingExecutor, get_worker_context
 
+# Output files with these suffixes are written as Zstd-compressed Feather, anything else as a gzipped TSV
+FEATHER_SUFFIXES = (".arrow", ".feather")
 
-def get_genes_from_sample(collection: MtxCollection, study: str, sample: str) -> Set[str]:
+
+def get_genes_from_sample(collection: MtxCollection, study: str, sample: str) -> pa.LargeStringArray:
     """Get unique genes from a single sample.
-    
+
     Args:
         collection: MtxCollection instance
         study: Study name
         sample: Sample name
-        
+
     Returns:
-        Set of unique genes found in the sample
+        Arrow array of the unique genes found in the sample
     """
     try:
-        _, _, features_df = collection.read_mtx(
-            collection.storage_directory / study / "mtx" / sample,
-            files=["features.tsv.gz"]
-        )
-        output_genes = set(features_df["gene"].tolist())
+        # Deduplicated in Arrow, and an Arrow array pickles as a few buffers rather than one object per gene
+        output_genes = pc.unique(collection.read_feature_names(study, sample)).cast(pa.large_string())
         logger.info(f"Found {len(output_genes)} genes in {study}/{sample}")
         return output_genes
     except Exception as e:
         logger.warning(f"Failed to read features for {study}/{sample}: {e}")
-        return set()
+        return pa.array([], type=pa.large_string())
 
 
 def main():
@@ -45,7 +47,8 @@ def main():
         "--output-file",
         type=str,
         required=True,
-        help="File to store the output gene list",
+        help="File to store the output gene list. Written as Feather if it ends in .arrow or .feather, "
+        "as a gzipped TSV otherwise",
     )
     parser.add_argument(
         "--include-studies",
@@ -74,46 +77,49 @@ def main():
     _set_level(level=10, add_file_handler=True, log_dir=log_dir, log_file="generate_gene_list.log")
 
     # Create collection
-    collection = MtxCollection(
-        storage_directory=args.raw_storage_dir,
-        include=args.include_studies
-    )
+    collection = MtxCollection(storage_directory=args.raw_storage_dir, include=args.include_studies)
 
-    # Prepare tasks for parallel processing
-    tasks = []
-    for study in collection.list_studies():
-        for sample in collection.list_samples(study):
-            tasks.append((collection, study, sample))
+    # Prepare tasks for parallel processing; they are generated as the executor consumes them
+    tasks = (
+        (collection, study, sample) for study in collection.list_studies() for sample in collection.list_samples(study)
+    )
 
     # Process samples in parallel
-    logger.info(f"Starting parallel processing of {len(tasks)} samples using {args.processes} processes...")
+    logger.info(f"Starting parallel processing of samples using {args.processes} processes...")
+    mp_context = get_worker_context()
+    log_queue, log_listener = start_log_listener(mp_context)
     executor = MultiprocessingExecutor(
-        processes=args.processes, 
-        init_worker_logging=init_worker_logging, 
-        init_args=(10, AnyPath(log_dir).as_posix(), "generate_gene_list.log")
+        processes=args.processes,
+        init_worker_logging=init_worker_queue_logging,
+        init_args=(10, log_queue),
+        context=mp_context,
     )
-    result = executor.run(tasks, get_genes_from_sample)
+    try:
+        result = executor.run(tasks, get_genes_from_sample)
+    finally:
+        log_listener.stop()
 
     if not result.all_successful:
         logger.warning(f"Failed to process {result.num_failures} samples")
 
     # Combine results
-    all_genes = set()
-    for gene_set in result.successes:
-        all_genes.update(gene_set)
-
-    unique_genes = sorted(list(all_genes))
+    all_genes = pc.unique(pa.chunked_array(result.successes, type=pa.large_string()))
+    unique_genes = all_genes.take(pc.sort_indices(all_genes))
     logger.info(f"Found {len(unique_genes)} unique genes in collection")
 
     # Write to output file
     output_path = AnyPath(args.output_file)
     logger.info(f"Writing gene list to {output_path}")
-    
-    df = pd.DataFrame(unique_genes, columns=["gene"])
-    df.to_csv(str(output_path), sep="\t", header=False, index=False, compression="gzip")
-    
+
+    if output_path.suffix in FEATHER_SUFFIXES:
+        with output_path.open("wb") as f:
+            feather.write_feather(pa.table({"gene": unique_genes}), f, compression="zstd", compression_level=9)
+    else:
+        df = pd.DataFrame({"gene": unique_genes.to_pandas()})
+        df.to_csv(str(output_path), sep="\t", header=False, index=False, compression="gzip")
+
     logger.info("Gene list generation complete")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
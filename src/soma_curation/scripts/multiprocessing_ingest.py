@@ -4,24 +4,156 @@ import pickle
 import multiprocessing
 import tiledbsoma.logging
 
+from multiprocessing.context import BaseContext
 from tiledbsoma.io import ExperimentAmbientLabelMapping
 from pathlib import Path
 from cloudpathlib import AnyPath
 
-from ..sc_logging import logger, _set_level, init_worker_logging
+from ..sc_logging import logger, _set_level, start_log_listener
 from ..ingest.ingestion_funcs import (
     create_registration_mapping,
     ingest_h5ad_soma,
+    ingest_h5ad_soma_shared,
     resize_experiment,
     convert_and_std_mtx_to_h5ad,
     convert_and_std_h5ad_to_h5ad,
+    convert_mtx_task,
+    convert_h5ad_task,
+    init_pipeline_worker,
 )
 from ..atlas.crud import AtlasManager
-from ..executor.executors import MultiprocessingExecutor
+from ..executor.executors import MultiprocessingExecutor, SerialExecutor, get_worker_context
+from ..utils.shared_pickle import share_pickled
 from ..config.config import PipelineConfig, RawCollectionType
 
-if multiprocessing.get_start_method(True) != "spawn":
-    multiprocessing.set_start_method("spawn", True)
+
+def _run_pipeline(pc: PipelineConfig, log_queue: multiprocessing.Queue, mp_context: BaseContext):
+    """Run the pipeline steps, with worker records sent to `log_queue` and workers started from `mp_context`."""
+    logger.info("Starting pipeline execution...")
+    logger.info(pc)
+
+    # 5) Initialize AtlasManager
+    am = AtlasManager(atlas_name=pc.atlas_name, storage_directory=pc.atlas_storage_dir, db_schema=pc.db_schema)
+
+    if not am.exists():
+        am.create()
+
+    # One pool of workers serves both parallel stages
+    mp_executor = MultiprocessingExecutor(
+        processes=pc.processes,
+        init_worker_logging=init_pipeline_worker,
+        init_args=(10, log_queue, pc),
+        context=mp_context,
+    )
+    # A single task, or a single process, is cheaper inline than through a worker
+    serial_executor = SerialExecutor()
+    with mp_executor:
+        # ---------------------------------------------------------------------
+        # STEP (1): Convert each study-sample into H5AD
+        # ---------------------------------------------------------------------
+        filenames = []
+        # The pickles are optional checkpoints for resuming a run; the objects are passed on in memory
+        filenames_pkl = AnyPath(pc.filenames_pickle) if pc.filenames_pickle else None
+
+        if filenames_pkl is not None and filenames_pkl.is_file():
+            logger.info(f"Found existing filenames pickle at {str(filenames_pkl)}. Skipping H5AD conversion.")
+            with open(filenames_pkl, "rb") as f:
+                filenames = pickle.load(f)
+        else:
+            tasks_to_convert = []
+
+            if pc.raw_collection_type == RawCollectionType.MTX:
+                for study in pc.collection.list_studies():
+                    for sample in pc.collection.list_samples(study_name=study):
+                        tasks_to_convert.append((study, sample))
+                        logger.info(f"Adding MTX {(study, sample)} to the multiprocessing queue.")
+                conversion_func, serial_conversion_func = convert_mtx_task, convert_and_std_mtx_to_h5ad
+            else:
+                for h5ad_file in pc.collection.list_h5ad_files():
+                    tasks_to_convert.append((h5ad_file,))
+                    logger.info(f"Adding H5AD file {h5ad_file} to the multiprocessing queue.")
+                conversion_func, serial_conversion_func = convert_h5ad_task, convert_and_std_h5ad_to_h5ad
+
+            logger.info("Starting parallel conversion to standardized H5AD files...")
+            # Workers get the config once from their initializer; inline runs pass it directly
+            if len(tasks_to_convert) <= 1 or pc.processes == 1:
+                convert_result = serial_executor.run([(*task, pc) for task in tasks_to_convert], serial_conversion_func)
+            else:
+                convert_result = mp_executor.run(tasks_to_convert, conversion_func)
+
+            # Gather successful conversions for the next step
+            filenames = convert_result.successes
+            logger.info(
+                f"Parallel conversion complete. {convert_result.num_successes} successes, "
+                f"{convert_result.num_failures} failures."
+            )
+
+            if not filenames:
+                logger.error("No files were successfully converted; exiting early.")
+                sys.exit(1)
+
+            # Save the successfully converted filenames to pickle
+            if filenames_pkl is not None:
+                with filenames_pkl.open("wb") as f:
+                    pickle.dump(filenames, f, protocol=pickle.HIGHEST_PROTOCOL)
+                logger.info(f"Filenames saved to {str(filenames_pkl)}.")
+
+        # ---------------------------------------------------------------------
+        # STEP (2): Create registration mapping or load from file
+        # ---------------------------------------------------------------------
+        registration_mapping_pkl = AnyPath(pc.registration_mapping_pickle) if pc.registration_mapping_pickle else None
+        tiledbsoma.logging.debug()
+        if registration_mapping_pkl is not None and registration_mapping_pkl.is_file():
+            logger.info(f"Found existing registration mapping at {str(registration_mapping_pkl)}, skipping creation.")
+            with registration_mapping_pkl.open("rb") as f:
+                rm = pickle.load(f)
+        else:
+            logger.info("Creating registration mapping (files are read in parallel, merged serially)...")
+            rm: ExperimentAmbientLabelMapping = create_registration_mapping(
+                experiment_uri=str(am.experiment_path),
+                filenames=filenames,
+                executor=None if len(filenames) <= 1 or pc.processes == 1 else mp_executor,
+            )
+            logger.info("Registration mapping created.")
+            if registration_mapping_pkl is not None:
+                with registration_mapping_pkl.open("wb") as f:
+                    pickle.dump(rm, f, protocol=pickle.HIGHEST_PROTOCOL)
+                logger.info(f"Registration mapping saved to {str(registration_mapping_pkl)}.")
+
+        # ---------------------------------------------------------------------
+        # STEP (3): Resize the experiment
+        # ---------------------------------------------------------------------
+        logger.info("Resizing experiment (serial step)...")
+        resize_experiment(str(am.experiment_path), registration_mapping=rm)
+        logger.info("Experiment resized successfully.")
+
+        # ---------------------------------------------------------------------
+        # STEP (4): Ingest H5AD files into the SOMA experiment
+        # ---------------------------------------------------------------------
+
+        logger.info("Starting parallel ingestion of H5AD files into experiment...")
+        if len(filenames) <= 1 or pc.processes == 1:
+            # Inline runs use the mapping as is
+            tasks_for_ingestion = [(fname, str(am.experiment_path), rm) for fname in filenames]
+            ingest_result = serial_executor.run(tasks_for_ingestion, ingest_h5ad_soma)
+        else:
+            # Pickle the mapping once into shared memory; tasks only carry its handle
+            rm_shm, rm_handle = share_pickled(rm)
+            try:
+                tasks_for_ingestion = [(fname, str(am.experiment_path), rm_handle) for fname in filenames]
+                ingest_result = mp_executor.run(tasks_for_ingestion, ingest_h5ad_soma_shared)
+            finally:
+                rm_shm.close()
+                rm_shm.unlink()
+    logger.info(
+        f"Ingestion complete. {ingest_result.num_successes} successes, " f"{ingest_result.num_failures} failures."
+    )
+
+    # If needed, you can decide how to handle the failures
+    if ingest_result.num_failures > 0:
+        logger.warning(f"{ingest_result.num_failures} H5AD ingestion tasks failed.")
+
+    logger.info("All pipeline steps completed. Exiting.")
 
 
 def main():
@@ -49,6 +181,11 @@ def main():
         help="Pickle path for storing/loading registration mapping. "
         "If provided and the file exists, creating the registration mapping is skipped.",
     )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Neither read nor write the filenames and registration mapping pickles.",
+    )
     parser.add_argument(
         "--raw-collection-type",
         type=str,
@@ -64,6 +201,8 @@ def main():
         help="List of studies to include. If not provided, all studies will be processed.",
     )
     args = parser.parse_args()
+    if args.no_checkpoint and (args.filenames_pkl or args.registration_mapping_pkl):
+        parser.error("--no-checkpoint cannot be combined with --filenames-pkl or --registration-mapping-pkl")
 
     # 1) Create a pipeline config
     pc = PipelineConfig(
@@ -74,8 +213,8 @@ def main():
         processes=args.processes,
         db_schema_uri=args.db_schema_fp,
         log_dir=args.log_dir,
-        filenames_pickle=args.filenames_pkl or "filenames.pkl",
-        registration_mapping_pickle=args.registration_mapping_pkl or "rm.pkl",
+        filenames_pickle=None if args.no_checkpoint else args.filenames_pkl or "filenames.pkl",
+        registration_mapping_pickle=None if args.no_checkpoint else args.registration_mapping_pkl or "rm.pkl",
         raw_collection_type=RawCollectionType(args.raw_collection_type),
         include_studies=args.include_studies,
     )
@@ -84,107 +223,12 @@ def main():
     log_dir = Path(pc.log_dir)
     log_dir.mkdir(parents=True, exist_ok=True)
     _set_level(level=10, add_file_handler=True, log_dir=log_dir, log_file=f"{pc.atlas_name}.log")
-
-    logger.info("Starting pipeline execution...")
-    logger.info(pc)
-
-    # 5) Initialize AtlasManager
-    am = AtlasManager(atlas_name=pc.atlas_name, storage_directory=pc.atlas_storage_dir, db_schema=pc.db_schema)
-
-    if not am.exists():
-        am.create()
-
-    # ---------------------------------------------------------------------
-    # STEP (1): Convert each study-sample into H5AD
-    # ---------------------------------------------------------------------
-    filenames = []
-    filenames_pkl = AnyPath(pc.filenames_pickle)
-
-    if filenames_pkl.is_file():
-        logger.info(f"Found existing filenames pickle at {str(filenames_pkl)}. Skipping H5AD conversion.")
-        with open(filenames_pkl, "rb") as f:
-            filenames = pickle.load(f)
-    else:
-        tasks_to_convert = []
-
-        if pc.raw_collection_type == RawCollectionType.MTX:
-            for study in pc.collection.list_studies():
-                for sample in pc.collection.list_samples(study_name=study):
-                    tasks_to_convert.append((study, sample, pc))
-                    logger.info(f"Adding MTX {(study, sample)} to the multiprocessing queue.")
-            conversion_func = convert_and_std_mtx_to_h5ad
-        else:
-            for h5ad_file in pc.collection.list_h5ad_files():
-                tasks_to_convert.append((h5ad_file, pc))
-                logger.info(f"Adding H5AD file {h5ad_file} to the multiprocessing queue.")
-            conversion_func = convert_and_std_h5ad_to_h5ad
-
-        # Create a multiprocessing executor with the specified number of processes
-        mp_executor = MultiprocessingExecutor(
-            processes=pc.processes,
-            init_worker_logging=init_worker_logging,
-            init_args=(10, log_dir.as_posix(), f"{pc.atlas_name}.log"),
-        )
-        logger.info("Starting parallel conversion to standardized H5AD files...")
-        convert_result = mp_executor.run(tasks_to_convert, conversion_func)
-
-        # Gather successful conversions for the next step
-        filenames = convert_result.successes
-        logger.info(
-            f"Parallel conversion complete. {convert_result.num_successes} successes, "
-            f"{convert_result.num_failures} failures."
-        )
-
-        if not filenames:
-            logger.error("No files were successfully converted; exiting early.")
-            sys.exit(1)
-
-        # Save the successfully converted filenames to pickle
-        with filenames_pkl.open("wb") as f:
-            pickle.dump(filenames, f)
-        logger.info(f"Filenames saved to {str(filenames_pkl)}.")
-
-    # ---------------------------------------------------------------------
-    # STEP (2): Create registration mapping or load from file
-    # ---------------------------------------------------------------------
-    registration_mapping_pkl = AnyPath(pc.registration_mapping_pickle)
-    tiledbsoma.logging.debug()
-    if registration_mapping_pkl.is_file():
-        logger.info(f"Found existing registration mapping at {str(registration_mapping_pkl)}, skipping creation.")
-        with registration_mapping_pkl.open("rb") as f:
-            rm = pickle.load(f)
-    else:
-        logger.info("Creating registration mapping (serial step)...")
-        rm: ExperimentAmbientLabelMapping = create_registration_mapping(experiment_uri=str(am.experiment_path), filenames=filenames)
-        with registration_mapping_pkl.open("wb") as f:
-            pickle.dump(rm, f)
-        logger.info(f"Registration mapping created and saved to {str(registration_mapping_pkl)}.")
-
-    # ---------------------------------------------------------------------
-    # STEP (3): Resize the experiment
-    # ---------------------------------------------------------------------
-    logger.info("Resizing experiment (serial step)...")
-    resize_experiment(str(am.experiment_path), registration_mapping=rm)
-    logger.info("Experiment resized successfully.")
-
-    # ---------------------------------------------------------------------
-    # STEP (4): Ingest H5AD files into the SOMA experiment
-    # ---------------------------------------------------------------------
-
-    logger.info("Starting parallel ingestion of H5AD files into experiment...")
-    tasks_for_ingestion = [(fname, str(am.experiment_path), rm) for fname in filenames]
-    mp_executor = MultiprocessingExecutor(
-        processes=pc.processes,
-        init_worker_logging=init_worker_logging,
-        init_args=(10, log_dir.as_posix(), f"{pc.atlas_name}.log"),
-    )
-    ingest_result = mp_executor.run(tasks_for_ingestion, ingest_h5ad_soma)
-    logger.info(
-        f"Ingestion complete. {ingest_result.num_successes} successes, " f"{ingest_result.num_failures} failures."
-    )
-
-    # If needed, you can decide how to handle the failures
-    if ingest_result.num_failures > 0:
-        logger.warning(f"{ingest_result.num_failures} H5AD ingestion tasks failed.")
-
-    logger.info("All pipeline steps completed. Exiting.")
+    # Worker records are funneled through a queue to this process' handlers
+    mp_context = get_worker_context()
+    log_queue, log_listener = start_log_listener(mp_context)
+
+    try:
+        _run_pipeline(pc, log_queue, mp_context)
+    finally:
+        # Also on failure, so that records still queued by the workers reach the log file
+        log_listener.stop()
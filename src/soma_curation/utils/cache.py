@@ -0,0 +1,8 @@
+import os
+
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """Directory for derived-file caches, `$SOMA_CURATION_CACHE_DIR` or `~/.cache/soma_curation`."""
+    return Path(os.environ.get("SOMA_CURATION_CACHE_DIR", Path.home() / ".cache" / "soma_curation"))
@@ -0,0 +1,29 @@
+import os
+
+
+def prefetch_local_file(path: str) -> bool:
+    """
+    Ask the kernel to start reading a local file into the page cache in the background (`POSIX_FADV_WILLNEED`).
+
+    HDF5 reads a file in many small synchronous requests; once the readahead has landed they are served from memory.
+    This is a hint only: URIs (cloud storage), platforms without `posix_fadvise`, and any OS error are silently skipped.
+
+    Args:
+        path (str): Path of the file to prefetch
+
+    Returns:
+        bool: Whether the hint was issued
+    """
+    if not hasattr(os, "posix_fadvise") or "://" in str(path):
+        return False
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
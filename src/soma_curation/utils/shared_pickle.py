@@ -0,0 +1,71 @@
+import pickle
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, NamedTuple, Tuple
+
+
+class SharedPickleHandle(NamedTuple):
+    """Location of a pickled object in a shared memory segment: the pickle stream, then its out-of-band buffers."""
+
+    name: str
+    sizes: Tuple[int, ...]
+
+
+# Objects already loaded by this process, with the segment kept open while out-of-band buffers may point into it
+_LOADED: Dict[str, Tuple[SharedMemory, Any]] = {}
+
+
+def share_pickled(obj: Any) -> Tuple[SharedMemory, SharedPickleHandle]:
+    """
+    Pickle `obj` once, with protocol 5 out-of-band buffers, into a new shared memory segment.
+
+    Only the small handle has to be sent to workers, which load the object with `load_shared_pickle`.
+    The caller owns the segment and must `close()` and `unlink()` it once the workers are done.
+
+    Args:
+        obj (Any): Object to share
+
+    Returns:
+        Tuple[SharedMemory, SharedPickleHandle]: The segment and the handle to pass to workers
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=lambda buffer: buffers.append(buffer.raw()))
+    chunks = [memoryview(data)] + buffers
+
+    shm = SharedMemory(create=True, size=sum(chunk.nbytes for chunk in chunks))
+    offset = 0
+    for chunk in chunks:
+        shm.buf[offset : offset + chunk.nbytes] = chunk.cast("B")
+        offset += chunk.nbytes
+    return shm, SharedPickleHandle(shm.name, tuple(chunk.nbytes for chunk in chunks))
+
+
+def load_shared_pickle(handle: SharedPickleHandle) -> Any:
+    """
+    Load an object shared with `share_pickled`. It is unpickled once per process; later calls with the same
+    handle return the same object.
+
+    Args:
+        handle (SharedPickleHandle): Handle returned by `share_pickled`
+
+    Returns:
+        Any: The shared object
+    """
+    loaded = _LOADED.get(handle.name)
+    if loaded is not None:
+        return loaded[1]
+
+    shm = SharedMemory(name=handle.name)
+    views, offset = [], 0
+    for size in handle.sizes:
+        views.append(shm.buf[offset : offset + size])
+        offset += size
+    obj = pickle.loads(views[0], buffers=views[1:])
+
+    views[0].release()
+    if len(views) == 1:
+        # Nothing points into the segment any more
+        shm.close()
+        shm = None
+    _LOADED[handle.name] = (shm, obj)
+    return obj
@@ -0,0 +1,110 @@
+import concurrent.futures
+import os
+import pytest
+
+from src.soma_curation.executor.executors import MultiprocessingExecutor, SerialExecutor, get_worker_context
+
+
+def square(x):
+    return x * x
+
+
+def fail_on_odd(x):
+    if x % 2:
+        raise ValueError(f"odd task {x}")
+    return x
+
+
+def exit_worker(x):
+    os._exit(1)
+
+
+def worker_pid(_):
+    return os.getpid()
+
+
+def _noop_initializer():
+    pass
+
+
+@pytest.fixture(scope="module")
+def mp_context():
+    """Forkserver context without the heavy preload, the tasks here only need this module."""
+    return get_worker_context(())
+
+
+def make_executor(mp_context, processes=2):
+    return MultiprocessingExecutor(processes=processes, init_worker_logging=_noop_initializer, context=mp_context)
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 3, 10])
+def test_run_returns_every_result(mp_context, chunksize):
+    result = make_executor(mp_context).run([(i,) for i in range(10)], square, chunksize=chunksize)
+
+    assert result.all_successful
+    assert sorted(result.successes) == [i * i for i in range(10)]
+
+
+@pytest.mark.parametrize("chunksize", [1, 4])
+def test_failures_are_reported_per_task(mp_context, chunksize):
+    """A failing task inside a chunk does not take the other tasks of the chunk with it."""
+    result = make_executor(mp_context).run([(i,) for i in range(9)], fail_on_odd, chunksize=chunksize)
+
+    assert sorted(result.successes) == [0, 2, 4, 6, 8]
+    assert sorted(task for task, _ in result.failures) == [(1,), (3,), (5,), (7,)]
+    for task, exc in result.failures:
+        assert isinstance(exc, ValueError)
+        assert str(exc) == f"odd task {task[0]}"
+
+
+def test_generator_tasks_with_bounded_submission(mp_context):
+    tasks = ((i,) for i in range(20))
+    result = make_executor(mp_context).run(tasks, square, max_in_flight=2, chunksize=3)
+
+    assert sorted(result.successes) == [i * i for i in range(20)]
+
+
+def test_empty_tasks(mp_context):
+    result = make_executor(mp_context).run([], square)
+
+    assert result.num_successes == 0
+    assert result.num_failures == 0
+
+
+def test_string_tasks_are_rejected(mp_context):
+    with pytest.raises(ValueError):
+        make_executor(mp_context).run(["abc"], square)
+    with pytest.raises(ValueError):
+        SerialExecutor().run(["abc"], square)
+
+
+def test_serial_executor_matches_multiprocessing(mp_context):
+    tasks = [(i,) for i in range(7)]
+    serial = SerialExecutor().run(tasks, fail_on_odd)
+    parallel = make_executor(mp_context).run(tasks, fail_on_odd, chunksize=2)
+
+    assert sorted(serial.successes) == sorted(parallel.successes)
+    assert sorted(task for task, _ in serial.failures) == sorted(task for task, _ in parallel.failures)
+
+
+def test_with_block_reuses_workers(mp_context):
+    with make_executor(mp_context) as executor:
+        first = executor.run([(i,) for i in range(8)], worker_pid)
+        second = executor.run([(i,) for i in range(8)], worker_pid)
+        assert executor._pool is not None
+
+    # Both runs were served by the same two workers
+    assert len(set(first.successes) | set(second.successes)) <= 2
+    assert executor._pool is None
+
+
+def test_dead_worker_fails_its_tasks_and_pool_is_replaced(mp_context):
+    with make_executor(mp_context) as executor:
+        broken = executor.run([(1,)], exit_worker)
+        assert broken.num_successes == 0
+        assert [task for task, _ in broken.failures] == [(1,)]
+        assert isinstance(broken.failures[0][1], concurrent.futures.process.BrokenProcessPool)
+
+        # The next run gets fresh workers instead of the broken pool
+        result = executor.run([(i,) for i in range(4)], square)
+        assert sorted(result.successes) == [0, 1, 4, 9]
@@ -102,7 +102,7 @@ def test_determine_samples_to_process(test_dirs, mock_schema, test_experiment):
 
 
 def test_feature_presence_script(
-    test_dirs, test_experiment, mock_schema, monkeypatch, test_experiment_name, dummy_h5ad_structure
+    tmp_path, test_dirs, test_experiment, mock_schema, monkeypatch, test_experiment_name, dummy_h5ad_structure
 ):
     """Test the full feature presence computation script."""
     # Prepare test arguments
@@ -118,8 +118,9 @@ def test_feature_presence_script(
         "mtx",
     ]
 
-    # Mock sys.argv
+    # Mock sys.argv; the script writes its log to ./logs, so run it from the test directory
     monkeypatch.setattr(sys, "argv", test_args)
+    monkeypatch.chdir(tmp_path)
 
     # Run the feature presence computation
     feature_presence_main()
@@ -154,6 +155,8 @@ def test_feature_presence_script(
         str(test_dirs["atlas"]),
         "--raw-collection-type",
         "h5ad",
+        "--log-dir",
+        str(test_dirs["logs"]),
         "--registration-mapping-pkl",
         str(test_dirs["rm_pkl"]),
         "--filenames-pkl",
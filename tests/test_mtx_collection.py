@@ -1,7 +1,12 @@
 import pytest
 from src.soma_curation.collection import MtxCollection
 from src.soma_curation.schema import load_schema
-from src.soma_curation.constants.create_dummy_structure import create_dummy_mtx_structure
+from src.soma_curation.constants.create_dummy_structure import (
+    create_dummy_mtx_structure,
+    create_cell_metadata_df,
+    create_mtx_files,
+    create_sample_metadata,
+)
 
 
 @pytest.fixture
@@ -89,3 +94,101 @@ def test_duplicate_samples_raises_error(duplicate_sample_storage_dir, db_schema)
     assert "study1" in error_message
     assert "study2" in error_message
     assert "study3" in error_message
+
+
+def test_write_anndata_matches_get_anndata(valid_storage_dir, db_schema, tmp_path):
+    """Test that the streamed h5ad write round-trips to the same AnnData as get_anndata."""
+    import anndata as ad
+    import numpy as np
+
+    collection = MtxCollection(storage_directory=valid_storage_dir, db_schema=db_schema)
+    study = collection.list_studies()[0]
+    sample = collection.list_samples(study)[0]
+
+    expected = collection.get_anndata(study_name=study, sample_name=sample)
+    out_path = collection.write_anndata(study_name=study, sample_name=sample, out_path=tmp_path / "sample.h5ad")
+    written = ad.read_h5ad(out_path)
+
+    assert written.shape == expected.shape
+    assert np.array_equal(written.X.toarray(), expected.X.toarray())
+    assert list(written.obs_names) == list(expected.obs_names)
+    assert list(written.var_names) == list(expected.var_names)
+    assert set(written.obs.columns) == set(expected.obs.columns)
+
+
+@pytest.fixture
+def multi_sample_storage_dir(tmp_path):
+    """Create a storage directory with a single study of four samples."""
+    import pandas as pd
+
+    storage_dir = tmp_path / "multi_sample_storage"
+    study_path = storage_dir / "study_0"
+    samples = {f"sample_{i}": [f"sample_{i}_barcode_{j}" for j in range(3)] for i in range(4)}
+
+    (study_path / "sample_metadata").mkdir(parents=True)
+    create_sample_metadata(study_path / "sample_metadata" / "study_0.tsv.gz", "study_0", list(samples))
+    for sample, barcodes in samples.items():
+        (study_path / "mtx" / sample).mkdir(parents=True)
+        create_mtx_files(study_path / "mtx" / sample, barcodes)
+    (study_path / "cell_metadata").mkdir()
+    pd.concat([create_cell_metadata_df(barcodes) for barcodes in samples.values()]).to_csv(
+        study_path / "cell_metadata" / "study_0.tsv.gz", sep="\t", index=False, compression="gzip"
+    )
+    return storage_dir
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 2])
+def test_iter_anndata_matches_get_anndata(multi_sample_storage_dir, db_schema, prefetch):
+    """Test that iteration yields every sample of a study, identical to get_anndata, with or without read-ahead."""
+    import numpy as np
+
+    collection = MtxCollection(storage_directory=multi_sample_storage_dir, db_schema=db_schema)
+    study = collection.list_studies()[0]
+
+    yielded = list(collection.iter_anndata(study_name=study, prefetch=prefetch))
+    assert [sample for sample, _ in yielded] == collection.list_samples(study)
+    assert len(yielded) == 4
+
+    for sample, adata in yielded:
+        expected = collection.get_anndata(study_name=study, sample_name=sample)
+        assert np.array_equal(adata.X.toarray(), expected.X.toarray())
+        assert list(adata.obs_names) == list(expected.obs_names)
+        assert all(barcode.startswith(f"{sample}_") for barcode in adata.obs_names)
+        assert adata.obs.equals(expected.obs)
+
+
+def test_iter_anndata_rejects_negative_prefetch(valid_storage_dir, db_schema):
+    collection = MtxCollection(storage_directory=valid_storage_dir, db_schema=db_schema)
+    with pytest.raises(ValueError, match="prefetch"):
+        next(collection.iter_anndata(study_name=collection.list_studies()[0], prefetch=-1))
+
+
+def test_metadata_cache_falls_back_to_source(valid_storage_dir, db_schema, tmp_path, monkeypatch):
+    """Test that the metadata cache stays out of the raw data tree and a damaged cache file is re-parsed."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(cache_dir))
+
+    collection = MtxCollection(storage_directory=valid_storage_dir, db_schema=db_schema)
+    study = collection.list_studies()[0]
+    expected = collection.get_cell_metadata(study)
+    assert len(expected) > 0
+    assert not list(valid_storage_dir.rglob("*.parquet"))
+
+    # A cache file cut short, e.g. read while another worker was still writing it
+    (cached,) = cache_dir.glob("metadata-*.parquet")
+    cached.write_bytes(cached.read_bytes()[:100])
+
+    assert collection.get_cell_metadata(study).equals(expected)
+
+
+def test_obs_join_keys_carry_only_the_sample(valid_storage_dir, db_schema):
+    """Test that merging study metadata does not leave study-wide categories on a sample's obs."""
+    import pandas as pd
+
+    collection = MtxCollection(storage_directory=valid_storage_dir, db_schema=db_schema)
+    study = collection.list_studies()[0]
+    sample = collection.list_samples(study)[0]
+    obs = collection.get_anndata(study_name=study, sample_name=sample).obs
+
+    assert not isinstance(obs["barcode"].dtype, pd.CategoricalDtype)
+    assert list(obs["sample_name"].cat.categories) == [sample]
@@ -0,0 +1,68 @@
+import anndata as ad
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+import tiledbsoma.io
+
+from src.soma_curation.executor.executors import MultiprocessingExecutor, SerialExecutor, get_worker_context
+from src.soma_curation.ingest.ingestion_funcs import (
+    create_registration_mapping,
+    merge_registration_mappings,
+    register_h5ad_task,
+)
+
+
+def _noop_initializer():
+    pass
+
+
+@pytest.fixture
+def h5ad_files(tmp_path):
+    """Write H5AD files whose cells and genes partly overlap, with genes in a different order in each file."""
+    contents = [
+        (["cell1", "cell2", "cell3"], ["A", "B", "D"]),
+        (["cell3", "cell4"], ["D", "C", "A"]),
+        (["cell5", "cell1", "cell6"], ["E", "B"]),
+    ]
+    paths = []
+    for i, (barcodes, genes) in enumerate(contents):
+        adata = ad.AnnData(
+            X=sp.csr_matrix(np.ones((len(barcodes), len(genes)), dtype=np.float32)),
+            obs=pd.DataFrame({"barcode": barcodes}, index=barcodes),
+            var=pd.DataFrame({"gene": genes}, index=genes),
+        )
+        path = tmp_path / f"file_{i}.h5ad"
+        adata.write_h5ad(path)
+        paths.append(str(path))
+    return paths
+
+
+def _register_h5ads(experiment_uri, filenames):
+    return tiledbsoma.io.register_h5ads(
+        experiment_uri, filenames, measurement_name="RNA", obs_field_name="barcode", var_field_name="gene"
+    )
+
+
+def test_merge_matches_serial_registration(h5ad_files):
+    """Merging per-file mappings onto a non-empty baseline gives the same join IDs as `register_h5ads`."""
+    baseline = _register_h5ads(None, h5ad_files[:1])
+    partials = [register_h5ad_task(path, "RNA", "barcode", "gene")[1] for path in h5ad_files[1:]]
+
+    assert merge_registration_mappings(baseline, partials) == _register_h5ads(None, h5ad_files)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_create_registration_mapping_with_executor(h5ad_files, parallel):
+    if parallel:
+        executor = MultiprocessingExecutor(
+            processes=2, init_worker_logging=_noop_initializer, context=get_worker_context(())
+        )
+    else:
+        executor = SerialExecutor()
+
+    rm = create_registration_mapping(None, h5ad_files, executor=executor)
+
+    assert rm == _register_h5ads(None, h5ad_files)
+    assert rm.get_obs_shape() == 6
+    assert rm.get_var_shapes()["RNA"] == 5
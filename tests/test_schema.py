@@ -0,0 +1,159 @@
+import pyarrow as pa
+
+from src.soma_curation.schema import load_schema, DEFAULT_DATABASE_SCHEMA_DICT
+
+
+def test_load_schema_is_cached():
+    """Test that the default schema is parsed once and shared, unless a mutable copy is requested."""
+    schema = load_schema()
+    assert load_schema() is schema
+    assert load_schema("") is schema
+
+    mutable_schema = load_schema(mutable=True)
+    assert mutable_schema is not schema
+    mutable_schema.PAI_OBS_PLATFORM_CONFIG["tiledb"]["create"]["capacity"] = 1
+    assert schema.PAI_OBS_PLATFORM_CONFIG["tiledb"]["create"]["capacity"] != 1
+
+
+def test_load_schema_leaves_defaults_untouched():
+    """Test that loading a schema does not convert the module-level default types in place."""
+    load_schema(mutable=True)
+    assert DEFAULT_DATABASE_SCHEMA_DICT["PAI_OBS_INDEX_COLUMNS"] == [("soma_joinid", "int64")]
+    assert not isinstance(DEFAULT_DATABASE_SCHEMA_DICT["PAI_PRESENCE_LAYER"], pa.DataType)
+
+
+def test_default_schema_matches_validated_construction(tmp_path, monkeypatch):
+    """Test that the unvalidated default schema is identical to one built through full validation."""
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(tmp_path / "cache"))
+    override = tmp_path / "schema.yaml"
+    override.write_text('PAI_SCHEMA_VERSION: "1.0.0"\n')
+
+    schema = load_schema()
+    validated = load_schema(str(override))
+    assert validated is not schema
+    assert validated.PAI_OBS_TERM_COLUMNS == schema.PAI_OBS_TERM_COLUMNS
+    assert validated.PAI_OBS_PLATFORM_CONFIG == schema.PAI_OBS_PLATFORM_CONFIG
+    assert validated.PAI_VAR_PLATFORM_CONFIG == schema.PAI_VAR_PLATFORM_CONFIG
+    assert validated.COMPUTED_COLUMN_FUNCTIONS == schema.COMPUTED_COLUMN_FUNCTIONS
+
+
+def test_shared_layer_templates_are_unshared_on_override(tmp_path, monkeypatch):
+    """Test that overriding one X layer config does not leak into the layer sharing its default template."""
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(tmp_path / "cache"))
+    override = tmp_path / "schema.yaml"
+    override.write_text("PAI_X_LAYERS_PLATFORM_CONFIG:\n  row_raw:\n    tiledb:\n      create:\n        capacity: 1\n")
+
+    layers = load_schema(str(override)).PAI_X_LAYERS_PLATFORM_CONFIG
+    assert layers["row_raw"]["tiledb"]["create"]["capacity"] == 1
+    assert layers["row_norm"]["tiledb"]["create"]["capacity"] == 131072
+    assert layers["row_raw"]["tiledb"]["create"]["dims"] == layers["row_norm"]["tiledb"]["create"]["dims"]
+
+
+def test_user_schema_parse_is_cached_on_disk(tmp_path, monkeypatch):
+    """Test that a parsed user schema is cached as JSON and re-used while the file is unchanged."""
+    from cloudpathlib import AnyPath
+    from src.soma_curation.schema import load as load_module
+
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(cache_dir))
+    override = tmp_path / "schema.yaml"
+    override.write_text('PAI_SCHEMA_VERSION: "2.0.0"\n')
+
+    assert load_module._read_user_schema(AnyPath(override)) == {"PAI_SCHEMA_VERSION": "2.0.0"}
+    cached_files = list(cache_dir.glob("schema-*.json"))
+    assert len(cached_files) == 1
+
+    # A cache hit skips YAML parsing
+    monkeypatch.setattr(load_module, "_yaml_loader", None)
+    assert load_module._read_user_schema(AnyPath(override)) == {"PAI_SCHEMA_VERSION": "2.0.0"}
+
+    # Changed contents hash to a new entry
+    monkeypatch.undo()
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(cache_dir))
+    override.write_text('PAI_SCHEMA_VERSION: "3.0.0"\n')
+    assert load_module._read_user_schema(AnyPath(override)) == {"PAI_SCHEMA_VERSION": "3.0.0"}
+    assert len(list(cache_dir.glob("schema-*.json"))) == 2
+
+
+def test_var_filters_follow_var_columns():
+    """Test that the var platform config is built from the var columns, not the obs ones."""
+    schema = load_schema()
+    create = schema.PAI_VAR_PLATFORM_CONFIG["tiledb"]["create"]
+    configured = set(create.get("dims", {})) | set(create.get("attrs", {}))
+    assert {name for name, _ in schema.PAI_VAR_TERM_COLUMNS} <= configured
+    assert not configured & {name for name, _ in schema.PAI_OBS_CELL_COLUMNS + schema.PAI_OBS_SAMPLE_COLUMNS}
+
+
+def test_index_columns_get_dimension_filters():
+    """Test that index columns are configured as dims and every other column as an attr."""
+    schema = load_schema()
+    for index, platform_config in (
+        (schema.PAI_OBS_INDEX_COLUMNS, schema.PAI_OBS_PLATFORM_CONFIG),
+        (schema.PAI_VAR_INDEX_COLUMNS, schema.PAI_VAR_PLATFORM_CONFIG),
+    ):
+        create = platform_config["tiledb"]["create"]
+        index_names = {name for name, _ in index}
+        assert set(create["dims"]) == index_names
+        assert not index_names & set(create["attrs"])
+
+
+def test_load_schema_reloads_edited_file(tmp_path, monkeypatch):
+    """Test that an edited schema file is parsed again instead of served from the cache."""
+    import os
+
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(tmp_path / "cache"))
+    override = tmp_path / "schema.yaml"
+    override.write_text('PAI_SCHEMA_VERSION: "2.0.0"\n')
+    first = load_schema(str(override))
+    assert load_schema(str(override)) is first
+
+    override.write_text('PAI_SCHEMA_VERSION: "3.0.0"\n')
+    os.utime(override, (0, os.stat(override).st_mtime + 10))
+    assert load_schema(str(override)).PAI_SCHEMA_VERSION == "3.0.0"
+
+
+def test_gene_set_is_cached_as_arrow(tmp_path, monkeypatch):
+    """Test that the sorted gene set is cached as an Arrow IPC file and served from it afterwards."""
+    from src.soma_curation.schema import objects
+
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(tmp_path / "cache"))
+    genes = tmp_path / "genes.tsv"
+    genes.write_text("GENE_B\nGENE_A\nGENE_B\n")
+    key = objects._gene_set_key(str(genes))
+
+    assert objects._sorted_core_genes_array.__wrapped__(*key).to_pylist() == ["GENE_A", "GENE_B"]
+    assert len(list((tmp_path / "cache").glob("genes-*.arrow"))) == 1
+
+    # A cache hit doesn't parse the TSV
+    monkeypatch.setattr(objects, "_read_gene_column", None)
+    assert objects._sorted_core_genes_array.__wrapped__(*key).to_pylist() == ["GENE_A", "GENE_B"]
+
+
+def test_rewritten_gene_set_is_read_again(tmp_path, monkeypatch):
+    """Test that the gene set caches are keyed on the file's modification, not only its path."""
+    import os
+    from src.soma_curation.schema import objects
+
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(tmp_path / "cache"))
+    genes = tmp_path / "genes.tsv"
+    genes.write_text("GENE_B\nGENE_A\n")
+    assert objects._sorted_core_genes(*objects._gene_set_key(str(genes))) == ("GENE_A", "GENE_B")
+
+    genes.write_text("GENE_C\nGENE_A\nGENE_D\n")
+    os.utime(genes, (0, os.stat(genes).st_mtime + 10))
+    assert objects._sorted_core_genes(*objects._gene_set_key(str(genes))) == ("GENE_A", "GENE_C", "GENE_D")
+    assert objects._var_table(*objects._gene_set_key(str(genes))).num_rows == 3
+
+
+def test_trusted_load_matches_validated_load(tmp_path, monkeypatch):
+    """Test that skipping validation for a trusted schema file gives the same schema as validating it."""
+    monkeypatch.setenv("SOMA_CURATION_CACHE_DIR", str(tmp_path / "cache"))
+    override = tmp_path / "schema.yaml"
+    override.write_text("PAI_VAR_COLUMNS:\n  - [gene, large_string]\n  - [ens, large_string]\n")
+
+    validated = load_schema(str(override))
+    trusted = load_schema(str(override), trusted=True)
+    assert trusted is not validated
+    expected_columns = [("gene", pa.large_string()), ("ens", pa.large_string())]
+    assert trusted.PAI_VAR_COLUMNS == validated.PAI_VAR_COLUMNS == expected_columns
+    assert trusted.PAI_VAR_PLATFORM_CONFIG == validated.PAI_VAR_PLATFORM_CONFIG
@@ -10,6 +10,7 @@ from src.soma_curation.schema import load_schema
 from src.soma_curation.constants.create_dummy_structure import create_dummy_mtx_structure
 from src.soma_curation.scripts.multiprocessing_ingest import main as ingest_main
 from src.soma_curation.collection import MtxCollection
+from src.soma_curation.utils import shared_pickle
 
 
 @pytest.fixture(scope="session")
@@ -91,8 +92,12 @@ def test_pipeline_run(test_dirs, dummy_mtx_structure, schema, monkeypatch):
     monkeypatch.setattr(sys, "argv", test_args)
 
     # Run the pipeline
+    loaded_before = dict(shared_pickle._LOADED)
     ingest_main()
 
+    # Inline ingestion uses the mapping directly, without a shared memory copy held by this process
+    assert shared_pickle._LOADED == loaded_before
+
     # Verify the atlas was created
     am = AtlasManager(atlas_name="test_atlas", storage_directory=str(test_dirs["atlas"]), db_schema=schema)
     assert am.exists(), "Atlas should have been created"
@@ -121,3 +126,96 @@ def test_pipeline_run(test_dirs, dummy_mtx_structure, schema, monkeypatch):
         filenames = pickle.load(f)
     assert isinstance(filenames, list), "Filenames should be a list"
     assert len(filenames) > 0, "Filenames list should not be empty"
+
+
+def test_pipeline_run_with_worker_pool(tmp_path, schema, monkeypatch):
+    """Test the pipeline with two worker processes: forkserver workers set up by `init_pipeline_worker`, the
+    parallel registration mapping and the registration mapping shared through shared memory."""
+    raw_dir, h5ad_dir, logs_dir = tmp_path / "raw", tmp_path / "h5ads", tmp_path / "logs"
+    raw_dir.mkdir()
+    create_dummy_mtx_structure(raw_dir)
+    shm_dir = Path("/dev/shm")
+    segments_before = set(shm_dir.glob("psm_*")) if shm_dir.is_dir() else set()
+
+    test_args = [
+        "src.soma_curation.scripts.multiprocessing_ingest",
+        "--processes",
+        "2",
+        "--atlas-name",
+        "pool_atlas",
+        "--raw-storage-dir",
+        str(raw_dir),
+        "--h5ad-storage-dir",
+        str(h5ad_dir),
+        "--atlas-storage-dir",
+        str(tmp_path / "atlas"),
+        "--registration-mapping-pkl",
+        str(tmp_path / "rm.pkl"),
+        "--filenames-pkl",
+        str(tmp_path / "filenames.pkl"),
+        "--log-dir",
+        str(logs_dir),
+    ]
+    monkeypatch.setattr(sys, "argv", test_args)
+    ingest_main()
+
+    # Conversion ran in the workers, which only received (study, sample) tasks
+    collection = MtxCollection(storage_directory=raw_dir, db_schema=schema)
+    verify_h5ad_files(h5ad_dir, collection)
+
+    with (tmp_path / "rm.pkl").open("rb") as f:
+        rm = pickle.load(f)
+    assert rm.get_obs_shape() == 9
+    assert rm.get_var_shapes() == {"RNA": 3}
+
+    # Worker records reach the main log file through the queue, after the mapping was loaded from shared memory
+    log_text = (logs_dir / "pool_atlas.log").read_text()
+    assert log_text.count("[convert_to_h5ad] Processing") == 3
+    assert log_text.count("[ingest_h5ad] Ingesting") == 3
+
+    # The shared memory segment is unlinked once ingestion is done
+    if shm_dir.is_dir():
+        assert set(shm_dir.glob("psm_*")) <= segments_before
+
+
+def test_pipeline_run_without_checkpoint(tmp_path, schema, monkeypatch):
+    """Test that `--no-checkpoint` runs every step without reading or writing the step pickles."""
+    raw_dir, h5ad_dir = tmp_path / "raw", tmp_path / "h5ads"
+    raw_dir.mkdir()
+    create_dummy_mtx_structure(raw_dir)
+    # The default pickle paths are relative, so any pickle written would land here
+    monkeypatch.chdir(tmp_path)
+
+    test_args = [
+        "src.soma_curation.scripts.multiprocessing_ingest",
+        "--processes",
+        "1",
+        "--atlas-name",
+        "no_checkpoint_atlas",
+        "--raw-storage-dir",
+        str(raw_dir),
+        "--h5ad-storage-dir",
+        str(h5ad_dir),
+        "--atlas-storage-dir",
+        str(tmp_path / "atlas"),
+        "--log-dir",
+        str(tmp_path / "logs"),
+        "--no-checkpoint",
+    ]
+    monkeypatch.setattr(sys, "argv", test_args)
+    ingest_main()
+
+    verify_h5ad_files(h5ad_dir, MtxCollection(storage_directory=raw_dir, db_schema=schema))
+    assert not list(tmp_path.rglob("*.pkl"))
+    log_text = (tmp_path / "logs" / "no_checkpoint_atlas.log").read_text()
+    assert "Registration mapping created." in log_text
+
+
+def test_no_checkpoint_conflicts_with_pickle_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["multiprocessing_ingest", "--no-checkpoint", "--filenames-pkl", str(tmp_path / "filenames.pkl")],
+    )
+    with pytest.raises(SystemExit):
+        ingest_main()
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.soma_curation.executor.executors import MultiprocessingExecutor, get_worker_context
+from src.soma_curation.utils import shared_pickle
+from src.soma_curation.utils.shared_pickle import load_shared_pickle, share_pickled
+
+
+def summarize_shared(handle):
+    obj = load_shared_pickle(handle)
+    return obj["name"], obj["values"].sum(), load_shared_pickle(handle) is obj
+
+
+def _noop_initializer():
+    pass
+
+
+@pytest.fixture
+def shared():
+    """Share an object with an out-of-band numpy buffer, and release the segment afterwards."""
+    obj = {"name": "mapping", "values": np.arange(1000, dtype=np.int64)}
+    shm, handle = share_pickled(obj)
+    yield obj, handle
+    loaded = shared_pickle._LOADED.pop(handle.name, None)
+    if loaded is not None and loaded[0] is not None:
+        loaded[1]["values"] = None
+        loaded[0].close()
+    shm.close()
+    shm.unlink()
+
+
+def test_round_trip_in_process(shared):
+    obj, handle = shared
+    # The pickle stream and the array buffer are stored as separate chunks
+    assert len(handle.sizes) == 2
+    assert handle.sizes[1] == obj["values"].nbytes
+
+    loaded = load_shared_pickle(handle)
+    assert loaded["name"] == obj["name"]
+    np.testing.assert_array_equal(loaded["values"], obj["values"])
+    # Loaded once per process
+    assert load_shared_pickle(handle) is loaded
+
+
+def test_round_trip_in_workers(shared):
+    obj, handle = shared
+    executor = MultiprocessingExecutor(
+        processes=2, init_worker_logging=_noop_initializer, context=get_worker_context(())
+    )
+    result = executor.run([(handle,)] * 4, summarize_shared)
+
+    assert result.all_successful
+    assert result.successes == [("mapping", obj["values"].sum(), True)] * 4